@@ -1,17 +1,233 @@
 """SYML (Simple YAML-like Markup Language) is a simple markup language with similar structure to YAML, but without all the gewgaws and folderol."""
 
+from collections.abc import Iterable, Iterator
 from io import TextIOBase
-from typing import Any
+from pathlib import Path
+from typing import Any, Literal, overload
 
-from . import parsers
+from . import batch, builders, parsers, views
+from .aio import aload, aloads
 from .basetypes import StrPath
+from .builders import Event
+from .cache import DiskCache
+from .dumpers import dump, dumps
+from .exceptions import ParseError
+from .parsers import Engine
+from .stats import ParseStats, add_observer, remove_observer
+from .utils import clear_caches, iter_mapped_lines
+from .views import LazyList, LazyMapping
 
+__all__ = [
+    'DiskCache',
+    'LazyList',
+    'LazyMapping',
+    'ParseStats',
+    'add_observer',
+    'aload',
+    'aloads',
+    'clear_caches',
+    'dump',
+    'dumps',
+    'iter_events',
+    'iter_load',
+    'load',
+    'load_many',
+    'load_path',
+    'loads',
+    'loads_many',
+    'loads_split',
+    'remove_observer',
+]
 
-def loads(document: str, filename: StrPath | None = None) -> list[Any] | dict[str, Any] | str:
-    """Load a SYML document from a string."""
-    return parsers.parse(document, filename=filename).as_data()
 
+@overload
+def loads(
+    document: str,
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    cache: DiskCache | None = None,
+    *,
+    lazy: Literal[False] = False,
+    stats: ParseStats | None = None,
+    intern_keys: bool = False,
+    dedupe_values: bool = False,
+) -> list[Any] | dict[str, Any] | str: ...
 
-def load(file_obj: TextIOBase, filename: StrPath | None = None) -> list[Any] | dict[str, Any] | str:
+
+@overload
+def loads(
+    document: str,
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    cache: DiskCache | None = None,
+    *,
+    lazy: Literal[True],
+    stats: ParseStats | None = None,
+    intern_keys: bool = False,
+    dedupe_values: bool = False,
+) -> LazyList | LazyMapping | str: ...
+
+
+def loads(
+    document: str,
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    cache: DiskCache | None = None,
+    *,
+    lazy: bool = False,
+    stats: ParseStats | None = None,
+    intern_keys: bool = False,
+    dedupe_values: bool = False,
+) -> Any:
+    """Load a SYML document from a string.
+
+    Given a `DiskCache`, a document that has been loaded before is read from the cache instead of being parsed.
+
+    With `lazy`, the document is parsed into a tree, and read-only views of its lists and mappings are returned that
+    convert each value only when it is first accessed.
+
+    Given a `ParseStats`, it is filled in with the timings and counts of the parse; see `syml.stats`.
+
+    With `intern_keys`, keys are interned, so that each distinct key is kept in memory once however often it is
+    repeated, and with `dedupe_values`, short text values repeated within the document are kept once too. The number
+    of copies dropped and the bytes saved are reported in the `ParseStats`. Both need the fast engine.
+    """
+    strings = builders.StringTable(keys=intern_keys, values=dedupe_values) if intern_keys or dedupe_values else None
+    if lazy:
+        if cache is not None:
+            raise ValueError('Lazy loading cannot use a cache')
+        if strings is not None:
+            raise ValueError('Lazy loading cannot share strings')
+        return views.view_entry(parsers.parse(document, filename=filename, engine=engine, stats=stats))
+    if cache is not None:
+        return cache.load(
+            document,
+            lambda text: parsers.parse_data(text, filename=filename, engine=engine, stats=stats, strings=strings),
+            filename=filename,
+            stats=stats,
+        )
+    return parsers.parse_data(document, filename=filename, engine=engine, stats=stats, strings=strings)
+
+
+@overload
+def load(
+    file_obj: TextIOBase,
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    cache: DiskCache | None = None,
+    *,
+    lazy: Literal[False] = False,
+    stats: ParseStats | None = None,
+    intern_keys: bool = False,
+    dedupe_values: bool = False,
+) -> list[Any] | dict[str, Any] | str: ...
+
+
+@overload
+def load(
+    file_obj: TextIOBase,
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    cache: DiskCache | None = None,
+    *,
+    lazy: Literal[True],
+    stats: ParseStats | None = None,
+    intern_keys: bool = False,
+    dedupe_values: bool = False,
+) -> LazyList | LazyMapping | str: ...
+
+
+def load(
+    file_obj: TextIOBase,
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    cache: DiskCache | None = None,
+    *,
+    lazy: bool = False,
+    stats: ParseStats | None = None,
+    intern_keys: bool = False,
+    dedupe_values: bool = False,
+) -> Any:
     """Load a SYML document from a file-like object."""
-    return loads(file_obj.read(), filename=filename)
+    return loads(  # type: ignore[call-overload,misc]
+        file_obj.read(),
+        filename=filename,
+        engine=engine,
+        cache=cache,
+        lazy=lazy,
+        stats=stats,
+        intern_keys=intern_keys,
+        dedupe_values=dedupe_values,
+    )
+
+
+def load_path(path: StrPath, *, mmap: bool = True) -> list[Any] | dict[str, Any] | str:
+    """Load a SYML document from a UTF-8 file.
+
+    By default the file is memory-mapped and read line by line, so that it is never copied into memory as a whole,
+    and only the text of its keys and values is kept. Parse errors are reported as for the whole document, with the
+    path as their `filename`.
+    """
+    try:
+        if mmap:
+            return builders.build_data_from_lines(iter_mapped_lines(path))
+        return loads(Path(path).read_text(encoding='utf-8'), filename=path)
+    except ParseError as exc:
+        exc.filename = path
+        raise
+
+
+def loads_many(
+    documents: Iterable[str],
+    filenames: Iterable[StrPath | None] | None = None,
+    workers: int | None = None,
+    engine: Engine = 'fast',
+) -> list[Any | ParseError]:
+    """Load many SYML documents from strings across a pool of `workers` processes.
+
+    Results are returned in the order of the documents. A document that fails to parse doesn't stop the batch: its
+    ParseError is returned in place of its data, with the document's filename (if given) as its `filename`. By default
+    there is one worker per CPU, and with one worker everything is done in this process.
+    """
+    documents = list(documents)
+    names = [None] * len(documents) if filenames is None else filenames
+    return batch.run(batch.load_text, [(d, n, engine) for d, n in zip(documents, names, strict=True)], workers)
+
+
+def loads_split(document: str, workers: int | None = None) -> list[Any] | dict[str, Any] | str:
+    """Load one large SYML document across a pool of `workers` processes.
+
+    A document whose top-level mapping or list starts in the first column is split before top-level keys or items
+    into parts of at least `batch.MIN_PART_SIZE` characters, and the data loaded from each part is put back together.
+    Anything else, or a document too small to split, is loaded as by `loads`, as are the rare documents where a line
+    in the first column continues the entry before it. The result and any ParseError are the same as from `loads`.
+    """
+    return batch.load_split(document, workers)
+
+
+def load_many(
+    paths: Iterable[StrPath], workers: int | None = None, engine: Engine = 'fast', encoding: str = 'utf-8'
+) -> list[Any | ParseError]:
+    """Load many SYML files across a pool of `workers` processes.
+
+    Each worker reads its own files. Results and errors are returned as by `loads_many`, with each file's path as the
+    `filename` of any ParseError.
+    """
+    return batch.run(batch.load_path, [(path, engine, encoding) for path in paths], workers)
+
+
+def iter_load(file_obj: TextIOBase) -> Iterator[Any]:
+    """Load a SYML document from a file-like object line by line, yielding each top-level entry once complete.
+
+    Yields the items of a top-level list, the (key, value) pairs of a top-level mapping, or a top-level text value,
+    holding only the entry being read in memory.
+    """
+    return builders.iter_data(file_obj)
+
+
+def iter_events(document: str) -> Iterator[Event]:
+    """Yield the parsing events of a SYML document, without building its node tree or data.
+
+    Reports the start and end of each list and mapping, and each key, text value and comment, with their offsets.
+    """
+    return builders.iter_events(document)
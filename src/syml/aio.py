@@ -0,0 +1,88 @@
+"""Loading SYML documents in asyncio applications without blocking the event loop
+
+Parsing is pure Python, so a large document would hold up every other task on the loop for as long as it takes to
+parse. The fast engine builds the data a batch of lines at a time instead, handing control back to the loop between
+batches. The other engines parse the whole document in a worker thread of the loop's executor.
+
+asyncio is only imported when these are first called, as it is slow to import for applications that never use it.
+"""
+
+from __future__ import annotations
+
+import codecs
+from typing import TYPE_CHECKING, Any
+
+from . import builders, parsers, scanner
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import AsyncIterable, AsyncIterator
+
+    from .basetypes import StrPath
+    from .parsers import Engine
+
+BATCH_LINES = 1000
+"""Number of lines parsed between handing control back to the event loop"""
+
+
+async def aloads(document: str, filename: StrPath | None = None, engine: Engine = 'fast') -> Any:  # noqa: ANN401
+    """Load a SYML document from a string, letting other tasks run while it is parsed."""
+    import asyncio
+
+    if engine != 'fast':
+        return await asyncio.to_thread(parsers.parse_data, document, filename, engine)
+    builder = builders.DataBuilder()
+    for number, line in enumerate(scanner.scan_lines(document), 1):
+        builder.add_line(document, line)
+        if not number % BATCH_LINES:
+            await asyncio.sleep(0)
+    return builder.finish()
+
+
+async def aload(
+    stream: AsyncIterable[str] | AsyncIterable[bytes],
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    encoding: str = 'utf-8',
+) -> Any:  # noqa: ANN401
+    """Load a SYML document from an async stream of text or bytes, such as an `asyncio.StreamReader`.
+
+    With the fast engine, each line is parsed as soon as it has been read. Bytes are decoded with `encoding`.
+    """
+    import asyncio
+
+    lines = iter_lines(stream, encoding)
+    if engine != 'fast':
+        return await aloads(''.join([line async for line in lines]), filename, engine)
+    builder = builders.DataBuilder()
+    index = 0
+    number = 1
+    count = 0
+    async for text in lines:
+        builders.add_text_line(builder, text, index, number)
+        index += len(text)
+        number += builders.count_lines(text)
+        count += 1
+        if not count % BATCH_LINES:
+            await asyncio.sleep(0)
+    return builder.finish()
+
+
+async def iter_lines(stream: AsyncIterable[str] | AsyncIterable[bytes], encoding: str) -> AsyncIterator[str]:
+    """Yield the lines of an async stream of text or bytes, line endings included, however the stream is chunked.
+
+    The chunks of a line are only joined once its end arrives, so a long line split into many chunks takes linear time.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending: list[str] = []
+    async for chunk in stream:
+        lines = (chunk if isinstance(chunk, str) else decoder.decode(chunk)).split('\n')
+        pending.append(lines[0])
+        if len(lines) > 1:
+            yield ''.join(pending) + '\n'
+            for line in lines[1:-1]:
+                yield line + '\n'
+            pending = [lines[-1]]
+    pending.append(decoder.decode(b'', final=True))
+    rest = ''.join(pending)
+    if rest:
+        yield rest
@@ -3,18 +3,43 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from syml import utils
 
 if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Iterable
+
     from parsimonious.nodes import Node as PNode
 
 
 StrPath = str | Path
 
+PathKey = str | int
+KeyPath = str | Sequence[PathKey]
+
+
+@dataclass(slots=True)
+class Document:
+    """The text of a SYML document and the file it came from, shared by every node parsed from it
+
+    The text is replaced when the document is edited, so that every node sees the edited text at once.
+    """
+
+    text: str
+    filename: StrPath | None = None
+    indexed: tuple[str, utils.LineIndex] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def lines(self) -> utils.LineIndex:
+        """Return the index of the document's lines, built on first use and again after each edit."""
+        if self.indexed is None or self.indexed[0] is not self.text:
+            self.indexed = (self.text, utils.LineIndex.from_text(self.text))
+        return self.indexed[1]
+
 
 @dataclass(slots=True, frozen=True)
 class Pos:
@@ -25,19 +50,16 @@ class Pos:
     column: int
 
     @classmethod
-    def from_str_index(cls, text: str, index: int) -> Pos:
+    def from_str_index(cls, text: str, index: int, lines: utils.LineIndex | None = None) -> Pos:
         """Get (line_number, col) of `index` in `string`.
 
-        Based on http://stackoverflow.com/a/24495900
+        Lines are looked up by bisecting `lines`, the index of the document's line offsets, so this is O(log n) in the
+        length of the document. The index is built from `text` if not given.
         """
-        lines = utils.split_lines(text, keepends=True)
-        curr_pos = 0
-        linenum = 0
-        for linenum, line in enumerate(lines):
-            if curr_pos + len(line) > index:
-                return cls(index, linenum + 1, index - curr_pos)
-            curr_pos += len(line)
-        return cls(len(text), linenum + 1, 0)
+        if lines is None:
+            lines = utils.LineIndex.from_text(text)
+        line_number, column = lines.locate(index)
+        return cls(min(index, len(text)), line_number, column)
 
 
 @dataclass(slots=True, repr=False, frozen=True)
@@ -52,11 +74,49 @@ class Source:
     @classmethod
     def from_node(cls, pnode: PNode, filename: StrPath | None = None) -> Source:
         """Build a Source from the given PNode, filename, and line value."""
+        return cls.from_span(pnode.full_text, pnode.start, pnode.end, filename=filename)
+
+    @classmethod
+    def from_span(
+        cls,
+        full_text: str,
+        start: int,
+        end: int,
+        filename: StrPath | None = None,
+        lines: utils.LineIndex | None = None,
+    ) -> Source:
+        """Build a Source from the span between the `start` and `end` indices of `full_text`, with `lines` its index."""
+        if lines is None:
+            lines = utils.LineIndex.from_text(full_text)
+        return cls(
+            filename=filename,
+            start=Pos.from_str_index(full_text, start, lines),
+            end=Pos.from_str_index(full_text, end, lines),
+            text=full_text[start:end],
+        )
+
+    @classmethod
+    def from_spans(
+        cls,
+        full_text: str,
+        spans: Iterable[tuple[int, int]],
+        separator: str = '\n',
+        filename: StrPath | None = None,
+        lines: utils.LineIndex | None = None,
+    ) -> Source:
+        """Build a single Source from several spans of `full_text`, joining their text with `separator`.
+
+        The Source runs from the start of the first span to the end of the last. All the text is joined at once, so
+        this is linear in the total length of the spans, where adding their Sources one at a time would be quadratic.
+        """
+        spans = list(spans)
+        if lines is None:
+            lines = utils.LineIndex.from_text(full_text)
         return cls(
             filename=filename,
-            start=Pos.from_str_index(pnode.full_text, pnode.start),
-            end=Pos.from_str_index(pnode.full_text, pnode.end),
-            text=pnode.text,
+            start=Pos.from_str_index(full_text, spans[0][0], lines),
+            end=Pos.from_str_index(full_text, spans[-1][1], lines),
+            text=separator.join(full_text[start:end] for start, end in spans),
         )
 
     @classmethod
@@ -74,10 +134,11 @@ class Source:
         if match is None:
             raise ValueError('No match found', substring)
         source_text = match.group() if source_text is None else source_text
+        lines = utils.LineIndex.from_text(text)
         return Source(
             filename=filename,
-            start=Pos.from_str_index(text, match.start()),
-            end=Pos.from_str_index(text, match.end()),
+            start=Pos.from_str_index(text, match.start(), lines),
+            end=Pos.from_str_index(text, match.end(), lines),
             text=source_text,
         )
 
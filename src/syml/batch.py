@@ -0,0 +1,152 @@
+"""Loading many SYML documents at once, or one large document in parts, across a pool of worker processes
+
+Parsing is pure Python and bound by the GIL, so batches are spread across processes rather than threads.
+"""
+
+from __future__ import annotations
+
+import os
+from itertools import starmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from . import builders, parsers, scanner
+from .basetypes import Pos
+from .exceptions import ParseError
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Callable, Sequence
+
+    from .basetypes import StrPath
+    from .parsers import Engine
+
+MIN_PART_SIZE = 1 << 20
+"""Smallest part of a document, in characters, worth loading in a worker process of its own"""
+
+
+def load_text(document: str, filename: StrPath | None, engine: Engine) -> Any:  # noqa: ANN401
+    """Load a SYML document, returning any parse error rather than raising it."""
+    try:
+        return parsers.parse_data(document, filename=filename, engine=engine)
+    except ParseError as exc:
+        exc.filename = filename
+        return exc
+
+
+def load_path(path: StrPath, engine: Engine, encoding: str) -> Any:  # noqa: ANN401
+    """Load a SYML document from a file, returning any parse error rather than raising it."""
+    return load_text(Path(path).read_text(encoding=encoding), path, engine)
+
+
+def run(func: Callable[..., Any], items: Sequence[tuple[Any, ...]], workers: int | None) -> list[Any]:
+    """Call `func` with each tuple of arguments across a pool of `workers` processes, keeping the results in order.
+
+    The items are handed out in chunks, so that batches of many small documents aren't dominated by the cost of
+    passing each one to a worker. With a single worker, everything is done in this process.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(items))
+    if workers <= 1:
+        return list(starmap(func, items))
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(items) // (workers * 4))
+        return list(executor.map(func, *zip(*items, strict=True), chunksize=chunksize))
+
+
+def first_line(text: str, start: int) -> scanner.Line | None:
+    """Scan the line starting at `start`, or return None for a blank or malformed line.
+
+    A malformed line is left to be reported when the part of the document holding it is loaded.
+    """
+    end = text.find('\n', start)
+    try:
+        return next(scanner.scan_lines(text, start, len(text) if end < 0 else end), None)
+    except ParseError:
+        return None
+
+
+def top_level_kind(text: str) -> str | None:
+    """Return whether a document is a mapping or a list with entries at the first column, or None for neither."""
+    start = 0
+    while start < len(text):
+        line = first_line(text, start)
+        if line is not None and line.elements[0].kind != scanner.COMMENT:
+            kind = line.elements[0].kind
+            return kind if line.level == 0 and kind in {scanner.KEY_VALUE, scanner.LIST_ITEM} else None
+        start = text.find('\n', start) + 1 or len(text)
+    return None
+
+
+def split_points(text: str, kind: str, parts: int) -> list[int]:
+    """Return the offsets of the lines splitting a document into about `parts` parts of similar size.
+
+    Parts start at the first line, or at a line starting a top-level key or list item of `kind` in the first column.
+    """
+    points = [0]
+    for part in range(1, parts):
+        start = text.find('\n', max(points[-1], len(text) * part // parts)) + 1
+        while 0 < start < len(text):
+            line = first_line(text, start)
+            if line is not None and line.level == 0 and line.elements[0].kind == kind:
+                points.append(start)
+                break
+            start = text.find('\n', start) + 1
+        else:
+            break
+    return points
+
+
+def load_part(text: str, next_kind: str | None) -> Any:  # noqa: ANN401
+    """Load part of a document, returning any parse error rather than raising it.
+
+    Returns the data of the part, and whether the top-level list or mapping would take the first line of the next part,
+    starting with an element of `next_kind`, rather than something within the last entry of this part.
+    """
+    builder = builders.DataBuilder()
+    try:
+        for line in scanner.scan_lines(text):
+            builder.add_line(text, line)
+    except ParseError as exc:
+        return exc
+    stack = builder.stack
+    if next_kind is None:
+        return builder.finish(), True
+    # The root takes the next line only if this part was all comments, leaving it as a fresh root would be:
+    taker = next((frame for frame in reversed(stack) if frame.can_add(next_kind, 0)), None)
+    takes_next = taker is not None and taker is stack[min(1, len(stack) - 1)]
+    return builder.finish(), takes_next
+
+
+def load_split(document: str, workers: int | None) -> Any:  # noqa: ANN401
+    """Load a large document in parts across a pool of `workers` processes, putting their data back together.
+
+    If a part turns out not to start a new top-level entry, the document is loaded as a whole instead. Parse errors
+    are raised with their position in the whole document.
+    """
+    workers = workers or os.cpu_count() or 1
+    kind = top_level_kind(document)
+    parts = min(workers * 4, len(document) // MIN_PART_SIZE)
+    if workers <= 1 or kind is None or parts <= 1:
+        return parsers.parse_data(document)
+    points = split_points(document, kind, parts)
+    ends = [*points[1:], len(document)]
+    items = [
+        (document[start:end], kind if end < len(document) else None) for start, end in zip(points, ends, strict=True)
+    ]
+    data = None
+    for start, result in zip(points, run(load_part, items, workers), strict=True):
+        if isinstance(result, ParseError):
+            message, pos, line_text = result.args
+            line = document.count('\n', 0, start) + pos.line
+            raise type(result)(message, Pos(start + pos.index, line, pos.column), line_text)
+        value, takes_next = result
+        if data is None:
+            data = value
+        elif isinstance(data, dict):
+            data.update(value)
+        else:
+            data.extend(value)
+        if not takes_next:
+            return parsers.parse_data(document)
+    return data
@@ -0,0 +1,205 @@
+"""Benchmarks for SYML parsing, conversion and writing
+
+Run with `python -m syml.bench`. Each operation is timed over generated documents of various shapes, reporting the
+best time of several runs, the throughput in MB/s and the peak memory allocated while it ran. Writing the loaded data
+with `dumps` is compared against `json.dumps` on the same data, except on corpora too deep for it. Pass `--json` to
+get machine-readable results for comparing runs across upgrades.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from . import dumps, loads, nodes, parsers
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Callable, Sequence
+
+
+def wide_mapping(scale: int) -> str:
+    """Generate a flat mapping with `scale` keys."""
+    return ''.join(f'key{i}: value {i}\n' for i in range(scale))
+
+
+def long_list(scale: int) -> str:
+    """Generate a flat list of `scale` items."""
+    return ''.join(f'- item {i}\n' for i in range(scale))
+
+
+def deep_nesting(scale: int) -> str:
+    """Generate branches of lists of single-key mappings, each nested up to 300 levels deep, `scale` levels in all."""
+    depth = min(scale, 300)
+    branch = ''.join(' ' * i + f'- level{i}:\n' for i in range(depth)) + ' ' * depth + 'leaf\n'
+    return ''.join(f'branch{n}:\n' + _indent(branch, 1) for n in range(max(scale // depth, 1)))
+
+
+def deep_list(scale: int) -> str:
+    """Generate a single list item, nested `scale` levels deep on one line, with no cap on the depth."""
+    return '- ' * scale + 'leaf\n'
+
+
+def long_text(scale: int) -> str:
+    """Generate text values spanning many continuation lines, `scale` lines in all."""
+    block = ''.join(f'  line {i} of a long block of multiline text\n' for i in range(100))
+    return ''.join(f'text{n}:\n{block}' for n in range(max(scale // 100, 1)))
+
+
+def comment_heavy(scale: int) -> str:
+    """Generate a mapping with `scale` keys, each surrounded by comments."""
+    return ''.join(
+        f'# about key{i}\n// more about key{i}\nkey{i}: value {i}\n  # trailing remark\n' for i in range(scale)
+    )
+
+
+def tab_indented(scale: int) -> str:
+    """Generate `scale` nested records indented with tabs."""
+    return ''.join(f'record{i}:\n\t- name: item {i}\n\t  tags:\n\t\t- a\n\t\t- b\n' for i in range(scale))
+
+
+def _indent(text: str, width: int) -> str:
+    return ''.join(' ' * width + line for line in text.splitlines(keepends=True))
+
+
+CORPORA: dict[str, Callable[[int], str]] = {
+    'wide_mapping': wide_mapping,
+    'long_list': long_list,
+    'deep_nesting': deep_nesting,
+    'deep_list': deep_list,
+    'long_text': long_text,
+    'comment_heavy': comment_heavy,
+    'tab_indented': tab_indented,
+}
+
+
+def prepare_text(text: str) -> tuple[str]:
+    """Prepare the arguments to an operation on the text itself."""
+    return (text,)
+
+
+def prepare_root(text: str) -> tuple[nodes.Root]:
+    """Prepare the arguments to an operation on a parsed node tree."""
+    return (parsers.parse(text),)
+
+
+def prepare_data(text: str) -> tuple[Any]:
+    """Prepare the arguments to an operation on loaded data."""
+    return (loads(text),)
+
+
+OPERATIONS: dict[str, tuple[Callable[[str], tuple[Any, ...]], Callable[..., Any]]] = {
+    'loads': (prepare_text, loads),
+    'parse': (prepare_text, parsers.parse),
+    'as_data': (prepare_root, nodes.Root.as_data),
+    'as_source': (prepare_root, nodes.Root.as_source),
+    'dumps': (prepare_data, dumps),
+    'json.dumps': (prepare_data, json.dumps),
+}
+
+
+SKIPPED: dict[str, set[str]] = {'deep_list': {'json.dumps'}}
+"""Operations left out on each corpus, as `json.dumps` recurses and cannot write data nested thousands deep"""
+
+
+class Result(NamedTuple):
+    """The result of benchmarking one operation on one corpus"""
+
+    corpus: str
+    operation: str
+    size: int
+    seconds: float
+    peak_memory: int
+
+    @property
+    def throughput(self) -> float:
+        """Return the throughput of the operation, in MB/s of document text."""
+        return self.size / self.seconds / 1e6 if self.seconds else float('inf')
+
+
+def measure(corpus: str, operation: str, text: str, repeat: int = 3) -> Result:
+    """Benchmark an operation on the given text, taking the best time of `repeat` runs."""
+    prepare, func = OPERATIONS[operation]
+    times = []
+    for _ in range(repeat):
+        args = prepare(text)
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    args = prepare(text)
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(corpus, operation, len(text.encode()), min(times), peak)
+
+
+def run(
+    corpora: Sequence[str] = tuple(CORPORA),
+    operations: Sequence[str] = tuple(OPERATIONS),
+    scale: int = 10_000,
+    repeat: int = 3,
+) -> list[Result]:
+    """Benchmark each operation on each corpus, generated at the given scale."""
+    results: list[Result] = []
+    for corpus in corpora:
+        text = CORPORA[corpus](scale)
+        skipped = SKIPPED.get(corpus, set())
+        results.extend(measure(corpus, operation, text, repeat) for operation in operations if operation not in skipped)
+    return results
+
+
+ROW = '{:<14} {:<10} {:>10} {:>10} {:>8} {:>10}'
+
+
+def format_results(results: Sequence[Result]) -> str:
+    """Format benchmark results as a table."""
+    lines = [ROW.format('corpus', 'operation', 'size (kB)', 'best (ms)', 'MB/s', 'peak (kB)')]
+    lines.extend(
+        ROW.format(
+            r.corpus,
+            r.operation,
+            f'{r.size / 1e3:.1f}',
+            f'{r.seconds * 1e3:.2f}',
+            f'{r.throughput:.2f}',
+            f'{r.peak_memory / 1e3:.1f}',
+        )
+        for r in results
+    )
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(prog='python -m syml.bench', description='Benchmark SYML parsing and writing.')
+    parser.add_argument('--corpus', action='append', choices=list(CORPORA), help='corpus to run (default: all)')
+    parser.add_argument(
+        '--operation', action='append', choices=list(OPERATIONS), help='operation to run (default: all)'
+    )
+    parser.add_argument('--scale', type=int, default=10_000, help='approximate number of entries per corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs per benchmark')
+    parser.add_argument('--json', action='store_true', help='write results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(
+        corpora=args.corpus or tuple(CORPORA),
+        operations=args.operation or tuple(OPERATIONS),
+        scale=args.scale,
+        repeat=args.repeat,
+    )
+    if args.json:
+        data = [{**r._asdict(), 'throughput': r.throughput} for r in results]
+        sys.stdout.write(json.dumps(data, indent=2) + '\n')
+    else:
+        sys.stdout.write(format_results(results))
+    return 0
+
+
+if __name__ == '__main__':  # pragma: nocover
+    sys.exit(main())
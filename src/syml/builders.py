@@ -0,0 +1,407 @@
+"""Builders that turn scanned SYML lines straight into output, without building a node tree"""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from . import scanner
+from .basetypes import Pos
+from .exceptions import OutOfContextNodeError, ParseError
+from .utils import LineIndex
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Iterable, Iterator
+
+    from .stats import ParseStats
+
+ROOT = 'root'
+LIST = 'list'
+MAPPING = 'mapping'
+
+CONTAINERS = frozenset({ROOT, scanner.LIST_ITEM, scanner.KEY_VALUE})
+
+
+class Frame:
+    """An open branch of the document being built
+
+    Mirrors a node of the tree `nodes.Root` would build. When building data, `target[key]` is where the frame's value
+    belongs: for a list, mapping or text frame that's its own value, and for the root, a list item or a key/value pair
+    it's the slot for its single child.
+    """
+
+    __slots__ = ('filled', 'key', 'kind', 'level', 'target', 'value')
+
+    def __init__(self, kind: str, level: int, target: Any = None, key: Any = None, value: Any = None) -> None:  # noqa: ANN401
+        self.kind = kind
+        self.level = level
+        self.target = target
+        self.key = key
+        self.value = value
+        self.filled = False
+
+    def can_add(self, kind: str, level: int) -> bool:
+        """Check if a line's outermost element may be added to this frame, as `SymlNode.can_add_node` would."""
+        if self.kind in CONTAINERS:
+            return not self.filled and (self.kind == ROOT or level > self.level)
+        if self.kind == LIST:
+            return kind == scanner.LIST_ITEM and level >= self.level
+        if self.kind == MAPPING:
+            return kind == scanner.KEY_VALUE and level >= self.level
+        return kind == scanner.TEXT
+
+
+class Builder:
+    """Incorporate the scanned lines of a SYML document without building a node tree
+
+    Lines are incorporated using an explicit stack of open frames, following the same rules as `nodes.SymlNode`.
+    Subclasses decide what to make of each element added and each frame closed.
+    """
+
+    def __init__(self) -> None:
+        self.stack = [Frame(ROOT, 0)]
+
+    def add_line(self, text: str, line: scanner.Line) -> None:
+        """Incorporate a line scanned from `text`."""
+        first = line.elements[0]
+        if first.kind == scanner.COMMENT:
+            self.add_comment(text, first)
+            return
+        self.close_to(text, line)
+        for element in line.elements:
+            self.add_element(text, element, line.level)
+
+    def close_to(self, text: str, line: scanner.Line) -> None:
+        """Close open frames until reaching one that the line may be added to."""
+        stack = self.stack
+        while not stack[-1].can_add(line.elements[0].kind, line.level):
+            if len(stack) == 1:
+                lines = LineIndex.from_text(text)
+                pos = Pos.from_str_index(text, line.start, lines)
+                raise OutOfContextNodeError('Failed to incorporate a node', pos, lines.get_line(text, pos.line))
+            self.close_frame(stack.pop())
+
+    def add_element(self, text: str, element: scanner.Element, level: int) -> None:  # pragma: nocover
+        """Add an element to the frame at the top of the stack."""
+        raise NotImplementedError
+
+    def add_comment(self, text: str, element: scanner.Element) -> None:
+        """Handle a comment line. Comments are ignored by default."""
+
+    def close_frame(self, frame: Frame) -> None:
+        """Handle a frame that has been closed."""
+
+    def finish(self) -> Any:  # noqa: ANN401
+        """Close any open frames."""
+        while self.stack:
+            self.close_frame(self.stack.pop())
+
+
+MAX_SHARED_LENGTH = 64
+"""Longest text value shared through a `StringTable`"""
+
+
+class StringTable:
+    """Equal strings to share within the data built from a document, rather than keeping a copy of each
+
+    With `keys`, keys are interned with `sys.intern`, so they are also shared with any other data using the same keys.
+    With `values`, text values of up to `MAX_SHARED_LENGTH` characters are shared through a table kept for the one
+    document. `shared` counts the copies dropped in favour of an equal string already seen, and `saved` their size in
+    bytes.
+    """
+
+    __slots__ = ('keys', 'saved', 'shared', 'table', 'values')
+
+    def __init__(self, *, keys: bool = True, values: bool = False) -> None:
+        self.keys = keys
+        self.values = values
+        self.table: dict[str, str] = {}
+        self.shared = 0
+        self.saved = 0
+
+    def key(self, key: str) -> str:
+        """Return the shared copy of a key."""
+        if not self.keys:
+            return key
+        return self.drop(key, sys.intern(key))
+
+    def value(self, value: str) -> str:
+        """Return the shared copy of a text value."""
+        if not self.values or len(value) > MAX_SHARED_LENGTH:
+            return value
+        return self.drop(value, self.table.setdefault(value, value))
+
+    def drop(self, string: str, shared: str) -> str:
+        """Count `string` as dropped in favour of `shared`, unless they are the same string."""
+        if shared is not string:
+            self.shared += 1
+            self.saved += sys.getsizeof(string)
+        return shared
+
+
+class DataBuilder(Builder):
+    """Build primitive data types from the scanned lines of a SYML document
+
+    The result is the same as `parsers.parse(text).as_data()`. Given a `StringTable`, equal keys and values share a
+    single string.
+    """
+
+    def __init__(self, strings: StringTable | None = None) -> None:
+        super().__init__()
+        self.strings = strings
+        self.result: list[Any] = [None]
+        root = self.stack[0]
+        root.target, root.key = self.result, 0
+
+    def add_element(self, text: str, element: scanner.Element, level: int) -> None:
+        """Add an element to the frame at the top of the stack."""
+        kind, start, end = element
+        stack = self.stack
+        frame = stack[-1]
+        if frame.kind in CONTAINERS:
+            frame.filled = True
+            if kind == scanner.KEY_VALUE:
+                mapping: dict[str, Any] = {}
+                frame.target[frame.key] = mapping
+                frame = Frame(MAPPING, level, frame.target, frame.key, mapping)
+                stack.append(frame)
+            elif kind == scanner.LIST_ITEM:
+                items: list[Any] = []
+                frame.target[frame.key] = items
+                frame = Frame(LIST, level, frame.target, frame.key, items)
+                stack.append(frame)
+            else:
+                stack.append(Frame(scanner.TEXT, level, frame.target, frame.key, [text[start:end]]))
+                return
+
+        if frame.kind == MAPPING:
+            key = text[start : end - 1]
+            if self.strings is not None:
+                key = self.strings.key(key)
+            frame.value[key] = None
+            stack.append(Frame(scanner.KEY_VALUE, level, frame.value, key))
+        elif frame.kind == LIST:
+            frame.value.append(None)
+            stack.append(Frame(scanner.LIST_ITEM, level, frame.value, len(frame.value) - 1))
+        else:
+            frame.value.append(text[start:end])
+
+    def close_frame(self, frame: Frame) -> None:
+        """Store the value of a finished text frame."""
+        if frame.kind == scanner.TEXT:
+            value = '\n'.join(frame.value)
+            frame.target[frame.key] = value if self.strings is None else self.strings.value(value)
+
+    def finish(self) -> Any:  # noqa: ANN401
+        """Close any open frames and return the finished data."""
+        super().finish()
+        return self.result[0]
+
+
+def build_data(text: str, stats: ParseStats | None = None, strings: StringTable | None = None) -> Any:  # noqa: ANN401
+    """Build primitive data types straight from the text of a SYML document, sharing strings through `strings` if given.
+
+    Given a `ParseStats`, scanning and building are timed together as they stream, in a single phase, and the elements
+    of the lines are counted by kind as they are scanned.
+    """
+    builder = DataBuilder(strings)
+    if stats is None:
+        for line in scanner.scan_lines(text):
+            builder.add_line(text, line)
+        return builder.finish()
+
+    counts = stats.nodes
+    depth = 1
+    with stats.phase('build_data'):
+        for line in scanner.scan_lines(text):
+            for element in line.elements:
+                counts[element.kind] += 1
+            builder.add_line(text, line)
+            depth = max(depth, len(builder.stack))
+        data = builder.finish()
+    stats.max_depth = max(stats.max_depth, depth)
+    if strings is not None:
+        stats.shared_strings += strings.shared
+        stats.bytes_saved += strings.saved
+    return data
+
+
+class StreamingDataBuilder(DataBuilder):
+    """Build primitive data, handing back each top-level entry as soon as it is complete
+
+    An entry of the top-level list or mapping is complete once the next line is added to that list or mapping, since
+    every frame within it has been closed by then. Completed entries are moved out of the result into `entries`, as
+    list items or (key, value) pairs, so only the entry being built is held in memory.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entries: list[Any] = []
+
+    def add_line(self, text: str, line: scanner.Line) -> None:
+        """Incorporate a line scanned from `text`, first moving out the entries it completes."""
+        if line.elements[0].kind != scanner.COMMENT:
+            self.close_to(text, line)
+            if len(self.stack) == 2 and self.stack[1].kind in {LIST, MAPPING}:
+                self.take_entries(self.stack[1].value)
+        super().add_line(text, line)
+
+    def take_entries(self, value: Any) -> None:  # noqa: ANN401
+        """Move the entries out of a top-level list or mapping."""
+        if isinstance(value, dict):
+            self.entries.extend(value.items())
+        else:
+            self.entries.extend(value)
+        value.clear()
+
+    def finish(self) -> None:
+        """Close any open frames, moving out the remaining entries."""
+        result = super().finish()
+        if isinstance(result, str):
+            self.entries.append(result)
+        elif result is not None:
+            self.take_entries(result)
+
+
+def add_text_line(builder: Builder, text: str, index: int, number: int) -> None:
+    """Add a line of a SYML document to a builder, given its index and line number in the whole document.
+
+    Parse errors are reported with their position in the whole document, rather than in the line being added. Lines
+    are numbered as `loads` numbers them, by str.splitlines(), so the line number of the next line is `number` plus
+    `count_lines(text)`.
+    """
+    try:
+        for line in scanner.scan_lines(text):
+            builder.add_line(text, line)
+    except ParseError as exc:
+        message, pos, line_text = exc.args
+        raise type(exc)(message, Pos(index + pos.index, number + pos.line - 1, pos.column), line_text) from None
+
+
+def count_lines(text: str) -> int:
+    """Return the number of lines in `text` as str.splitlines() counts them, so one line read from a file may count as several."""
+    return len(text.splitlines())
+
+
+def add_lines(builder: Builder, lines: Iterable[str]) -> Iterator[None]:
+    """Add a SYML document to a builder line by line, pausing after each line."""
+    index = 0
+    number = 1
+    for text in lines:
+        add_text_line(builder, text, index, number)
+        yield
+        index += len(text)
+        number += count_lines(text)
+
+
+def build_data_from_lines(lines: Iterable[str]) -> Any:  # noqa: ANN401
+    """Build primitive data types from a SYML document, reading it line by line."""
+    builder = DataBuilder()
+    for _ in add_lines(builder, lines):
+        pass
+    return builder.finish()
+
+
+def iter_data(lines: Iterable[str]) -> Iterator[Any]:
+    """Yield each top-level entry of a SYML document, reading it line by line.
+
+    Yields the items of a top-level list, the (key, value) pairs of a top-level mapping (duplicate keys included), or
+    the whole of a top-level text value.
+    """
+    builder = StreamingDataBuilder()
+    for _ in add_lines(builder, lines):
+        yield from builder.entries
+        builder.entries.clear()
+    builder.finish()
+    yield from builder.entries
+
+
+START_MAPPING = 'start_mapping'
+END_MAPPING = 'end_mapping'
+START_LIST = 'start_list'
+END_LIST = 'end_list'
+KEY = 'key'
+SCALAR = 'scalar'
+COMMENT = 'comment'
+
+
+class Event(NamedTuple):
+    """A parsing event, spanning from `start` to `end` in the document
+
+    Start and end events are zero-width, at the start of the first element and the end of the last element of their
+    list or mapping. A key/value pair without a value is followed by a zero-width `scalar` event with a value of None.
+    """
+
+    type: str
+    value: str | None
+    start: int
+    end: int
+
+
+class EventBuilder(Builder):
+    """Report the structure of a SYML document as a stream of events
+
+    Events are collected in `events`, in document order, except that a text value is reported once its last line has
+    been seen, after any comments within it.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[Event] = []
+        self.end = 0
+
+    def add_element(self, text: str, element: scanner.Element, level: int) -> None:
+        """Add an element to the frame at the top of the stack, reporting any events it starts."""
+        kind, start, end = element
+        stack = self.stack
+        frame = stack[-1]
+        if frame.kind in CONTAINERS:
+            frame.filled = True
+            if kind == scanner.KEY_VALUE:
+                self.events.append(Event(START_MAPPING, None, start, start))
+                frame = Frame(MAPPING, level)
+                stack.append(frame)
+            elif kind == scanner.LIST_ITEM:
+                self.events.append(Event(START_LIST, None, start, start))
+                frame = Frame(LIST, level)
+                stack.append(frame)
+            else:
+                stack.append(Frame(scanner.TEXT, level, key=start, value=[text[start:end]]))
+                self.end = end
+                return
+
+        if frame.kind == MAPPING:
+            self.events.append(Event(KEY, text[start : end - 1], start, end - 1))
+            stack.append(Frame(scanner.KEY_VALUE, level))
+        elif frame.kind == LIST:
+            stack.append(Frame(scanner.LIST_ITEM, level))
+        else:
+            frame.value.append(text[start:end])
+        self.end = end
+
+    def add_comment(self, text: str, element: scanner.Element) -> None:
+        """Report a comment."""
+        _, start, end = element
+        self.events.append(Event(COMMENT, text[start:end], start, end))
+
+    def close_frame(self, frame: Frame) -> None:
+        """Report the end of a frame's value."""
+        if frame.kind == scanner.TEXT:
+            self.events.append(Event(SCALAR, '\n'.join(frame.value), frame.key, self.end))
+        elif frame.kind == MAPPING:
+            self.events.append(Event(END_MAPPING, None, self.end, self.end))
+        elif frame.kind == LIST:
+            self.events.append(Event(END_LIST, None, self.end, self.end))
+        elif frame.kind == scanner.KEY_VALUE and not frame.filled:
+            self.events.append(Event(SCALAR, None, self.end, self.end))
+
+
+def iter_events(text: str) -> Iterator[Event]:
+    """Yield the parsing events of a SYML document, without building a node tree or its data."""
+    builder = EventBuilder()
+    for line in scanner.scan_lines(text):
+        builder.add_line(text, line)
+        yield from builder.events
+        builder.events.clear()
+    builder.finish()
+    yield from builder.events
@@ -0,0 +1,158 @@
+"""A persistent on-disk cache of loaded SYML documents
+
+Like `.pyc` files for Python modules, cache entries let unchanged documents be loaded without parsing them again.
+Entries are keyed by a hash of the document's text, the library version and the Python version, so a document is
+parsed again whenever any of them changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .stats import collector, notify, phase
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Callable
+
+    from .basetypes import StrPath
+    from .stats import ParseStats
+
+FORMAT_VERSION = 1
+SUFFIX = '.symlc'
+
+
+def library_version() -> str:
+    """Return the installed version of this library."""
+    from importlib import metadata
+
+    try:
+        return metadata.version('syml')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class DiskCache:
+    """A directory of loaded documents, evicting the least recently used once it grows past `max_bytes`
+
+    Loaded data is stored with `marshal`, the compact binary format used for `.pyc` files, which only handles the plain
+    strings, lists and dicts that SYML documents load as. Entries are written atomically, so several processes may
+    share a cache directory. Unreadable entries are treated as missing.
+
+    `size` is this instance's estimate of the size of the cache: it is read from the directory on the first store, and
+    then only counts the entries this instance writes. Entries written by other processes are only seen when the
+    estimate goes over `max_bytes`, at which point the directory is listed again to evict entries from it.
+    """
+
+    def __init__(self, directory: StrPath, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.salt = f'{FORMAT_VERSION}:{library_version()}:{sys.implementation.cache_tag}\0'.encode()
+        self.lock = threading.Lock()
+        self.size: int | None = None
+
+    def key(self, document: str) -> str:
+        """Return the cache key for a document."""
+        return hashlib.sha256(self.salt + document.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def path(self, document: str) -> Path:
+        """Return the path of the cache entry for a document."""
+        return self.directory / (self.key(document) + SUFFIX)
+
+    def load(
+        self,
+        document: str,
+        loader: Callable[[str], Any],
+        filename: StrPath | None = None,
+        stats: ParseStats | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Return the cached data for a document, loading it with `loader` and caching it if it isn't cached yet.
+
+        A cache hit is reported to `stats` and to any observers as a parse by the `cache` engine, with the time spent
+        reading the entry in a `cache` phase. A miss is left to `loader` to report.
+        """
+        path = self.path(document)
+        collected = collector(stats)
+        with phase(collected, 'cache'):
+            try:
+                data = marshal.loads(path.read_bytes())  # noqa: S302
+            except (OSError, EOFError, ValueError, TypeError):
+                hit = False
+            else:
+                hit = True
+        if hit:
+            with suppress(OSError):
+                os.utime(path)
+            if collected is not None:
+                collected.start(document, filename, 'cache')
+                notify(collected)
+            return data
+
+        data = loader(document)
+        self.store(path, marshal.dumps(data))
+        return data
+
+    def store(self, path: Path, payload: bytes) -> None:
+        """Atomically write a cache entry, then evict old entries if the cache has grown too large."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fo:
+                fo.write(payload)
+            Path(tmp).replace(path)
+        except BaseException:  # pragma: nocover
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        with self.lock:
+            if self.size is None:
+                self.size = self.total_size()
+            else:
+                self.size += len(payload) - replaced
+            if self.size > self.max_bytes:
+                self.size = self.evict()
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        """Return the (last used time, size, path) of each cache entry, least recently used first."""
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.glob('*' + SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # pragma: nocover
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def total_size(self) -> int:
+        """Return the total size of the cache entries."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """Remove the least recently used entries until the cache fits in `max_bytes`, returning its new size."""
+        entries = self.entries()
+        size = sum(size for _, size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        return size
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        with self.lock:
+            for _, _, path in self.entries():
+                path.unlink(missing_ok=True)
+            self.size = 0
@@ -0,0 +1,194 @@
+"""Writing primitive data as SYML documents"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from . import scanner
+from .exceptions import DumpError, MalformedLineError
+from .scanner import Element
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Iterator
+    from typing import Protocol
+
+    class SupportsWrite(Protocol):
+        """A file-like object that text can be written to"""
+
+        def write(self, text: str, /) -> object: ...  # noqa: D102
+
+
+CHUNK_SIZE = 64 * 1024
+
+Task = tuple[Any, str, int, str]
+
+# Keys and lines of text that can't be read as structure, comments or indentation, wherever they are written:
+PLAIN_KEY_RE = re.compile(r'[^\s:#/\-][^\s:]*')
+PLAIN_TEXT_RE = re.compile(r'[^\s:#/\-][^:]*')
+
+
+def check_key(key: Any, prefix: str) -> str:  # noqa: ANN401
+    """Check that a key, following `prefix` at the start of a line, would be read back unchanged."""
+    if not isinstance(key, str):
+        raise TypeError('SYML keys must be strings', key)
+    if PLAIN_KEY_RE.fullmatch(key):
+        return key
+    end = len(prefix) + len(key) + 1
+    if scan(f'{prefix}{key}:')[-1:] != [Element(scanner.KEY_VALUE, len(prefix), end)]:
+        raise DumpError('Cannot write key', key)
+    return key
+
+
+def check_line(line: str, prefix: str, value: str) -> None:
+    """Check that a line of text, following `prefix` on a line of its own, would be read back unchanged."""
+    if PLAIN_TEXT_RE.fullmatch(line):
+        return
+    end = len(prefix) + len(line)
+    if prefix and scan(prefix + line)[-1:] == [Element(scanner.TEXT, len(prefix), end)]:
+        return
+    if not prefix and line[:1].strip() and scan(line) == [Element(scanner.TEXT, 0, end)]:
+        return
+    raise DumpError('Cannot write text', value)
+
+
+def scan(line: str) -> list[Element]:
+    """Scan a single line, returning no elements if it is malformed."""
+    try:
+        return scanner.scan_line(line, 0, len(line))
+    except MalformedLineError:
+        return []
+
+
+def iter_dump(data: Any, lead: str = '') -> Iterator[str]:  # noqa: ANN401
+    """Yield the lines of a SYML document representing `data`, line endings included.
+
+    The data may be made of strings, lists and dicts with string keys, with None for a key without a value. Values are
+    written with the same indentation rules the parser uses, so that loading the document gives back equal data, and
+    DumpError is raised for data that SYML cannot represent: empty strings, lists and dicts, None outside of a dict,
+    text with blank lines or lines that would be read as structure, comments or indentation, and a list directly
+    within a list other than as its last item. Nested data is written using an explicit stack rather than recursion.
+
+    Given a `lead` of spaces and list item dashes, the first line starts with it, as if the data were written within
+    the lists it starts.
+
+    Each task on the stack is a value, the text to write before its first line, the column of its content, and a
+    stand-in for the text before its first line to check that line with.
+    """
+    if data is None:
+        return
+    stack: list[Task] = [(data, lead, len(lead), '')]
+    while stack:
+        value, lead, column, prefix = stack.pop()
+        if isinstance(value, str):
+            if '\n' not in value:
+                check_line(value, prefix, value)
+                yield f'{lead}{value}\n'
+                continue
+            first, *rest = value.split('\n')
+            check_line(first, prefix, value)
+            yield f'{lead}{first}\n'
+            indent = ' ' * column
+            for line in rest:
+                check_line(line, '', value)
+                yield f'{indent}{line}\n'
+        elif isinstance(value, dict):
+            stack.extend(reversed(mapping_tasks(value, lead, column)))
+        elif isinstance(value, list | tuple):
+            stack.extend(reversed(list_tasks(value, lead, column)))
+        elif value is None:
+            yield f'{lead}\n'
+        else:
+            raise TypeError('Cannot write a value of this type as SYML', type(value))
+
+
+def starts_open(value: Any) -> bool:  # noqa: ANN401
+    """Check if a value is a mapping whose first key has no value."""
+    return isinstance(value, dict) and bool(value) and next(iter(value.values())) is None
+
+
+def ends_open(value: Any) -> bool:  # noqa: ANN401
+    """Check if a value is a mapping that ends with a key without a value, lined up with the dash before it."""
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and (len(value) == 1 or starts_open(value))
+        and value[next(reversed(value))] is None
+    )
+
+
+def dash_level(lead: str) -> int:
+    """Return the indentation of the line a lead starts."""
+    return len(lead) - len(lead.lstrip(' '))
+
+
+def mapping_tasks(value: dict[Any, Any], lead: str, column: int) -> list[Task]:
+    """Return the tasks writing each key of a mapping, and its value, in order.
+
+    A key without a value takes any more deeply indented line after it as its value. When the first key is on the
+    same line as a list item's dash and has no value, the keys after it are lined up with the dash instead.
+    """
+    if not value:
+        raise DumpError('Cannot write an empty mapping', value)
+    key_column = dash_level(lead) if starts_open(value) else column
+    tasks: list[Task] = []
+    for index, (key, item) in enumerate(value.items()):
+        if index == 0:
+            key_lead = lead + check_key(key, '- ' if lead.endswith('- ') else '') + ':'
+        else:
+            key_lead = ' ' * key_column + check_key(key, '') + ':'
+        child_column = (column if index == 0 else key_column) + 2
+        if isinstance(item, str):
+            tasks.append((item, key_lead + ' ', child_column, 'k: '))
+        else:
+            tasks.append((None, key_lead, child_column, ''))
+            if item is not None:
+                tasks.append((item, ' ' * child_column, child_column, ''))
+    return tasks
+
+
+def list_tasks(value: list[Any] | tuple[Any, ...], lead: str, column: int) -> list[Task]:
+    """Return the tasks writing each item of a list, in order.
+
+    A list within a list item shares its first line, and so its indentation, with the list around it, and takes any
+    item after it as its own, so it must be the last item or be indented further than the list around it. For the
+    same reason, the items after a mapping whose first key has no value are lined up with the dash before it.
+    """
+    if not value:
+        raise DumpError('Cannot write an empty list', value)
+    item_column = dash_level(lead) if starts_open(value[0]) else column
+    tasks: list[Task] = []
+    for index, item in enumerate(value):
+        if item is None:
+            raise DumpError('Cannot write None as a list item', value)
+        if index == 0:
+            tasks.append((item, lead + '- ', column + 2, '- '))
+        elif isinstance(item, list | tuple) and index < len(value) - 1:
+            if ends_open(value[index - 1]):
+                raise DumpError('Cannot write a list within a list after a key without a value', value)
+            tasks.append((item, ' ' * (item_column + 2) + '- ', item_column + 4, '- '))
+        else:
+            tasks.append((item, ' ' * item_column + '- ', item_column + 2, '- '))
+    if isinstance(value[0], list | tuple) and len(value) > 1:
+        raise DumpError('Cannot write a list within a list as its first item, unless it is the only one', value)
+    return tasks
+
+
+def dumps(data: Any) -> str:  # noqa: ANN401
+    """Write primitive data as a SYML document."""
+    return ''.join(iter_dump(data))
+
+
+def dump(data: Any, file_obj: SupportsWrite, chunk_size: int = CHUNK_SIZE) -> None:  # noqa: ANN401
+    """Write primitive data as a SYML document to a file-like object, in chunks of about `chunk_size` characters."""
+    chunk: list[str] = []
+    size = 0
+    for line in iter_dump(data):
+        chunk.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            file_obj.write(''.join(chunk))
+            chunk.clear()
+            size = 0
+    if chunk:
+        file_obj.write(''.join(chunk))
@@ -0,0 +1,182 @@
+"""Editing parsed SYML documents in place
+
+An edit writes only the lines of the key or list item it changes, copying the rest of the document as it was, so
+comments and formatting elsewhere are kept. The tree is then updated with `Root.apply_edit`, which parses only the
+top-level entries the edit touches again.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from . import builders, dumpers, nodes
+from .exceptions import DumpError, ParseError
+from .parsers import line_start
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Callable, Sequence
+
+    from .basetypes import PathKey
+
+
+def line_end(text: str, index: int) -> int:
+    """Return the index of the end of the line containing `index`."""
+    end = text.find('\n', index)
+    return len(text) if end < 0 else end
+
+
+def lead_for(prefix: str) -> str:
+    """Return the text before an entry on its line as spaces and dashes, with tabs in its indentation as 4 spaces."""
+    content = prefix.lstrip()
+    indent = prefix[: len(prefix) - len(content)].replace('\t', ' ' * 4)
+    return ' ' * len(indent) + content.replace('\t', ' ')
+
+
+def next_indent(text: str, entry: nodes.SymlNode) -> str:
+    """Return the indentation for an entry following `entry` in its list or mapping.
+
+    An entry on a line of its own is followed at the same indentation. An entry sharing its line with the dash of a
+    list item is followed at the same column, unless that line ends in a key without a value, which would take the
+    entry as its own; then the following entry is lined up with the line's indentation instead.
+    """
+    prefix = text[line_start(text, entry.start) : entry.start]
+    if not prefix.strip():
+        return prefix
+    end = line_end(text, entry.start)
+    node = entry
+    while node.children and node.children[0].start < end:
+        node = node.children[0]
+    if isinstance(node, nodes.KeyValue) and not node.children:
+        return prefix[: len(prefix) - len(prefix.lstrip())]
+    return ' ' * len(lead_for(prefix))
+
+
+def render(entry: dict[str, Any] | list[Any], lead: str) -> str:
+    """Write a single key/value pair or list item following `lead`, without the lead or the final line ending."""
+    return ''.join(dumpers.iter_dump(entry, lead))[len(lead) : -1]
+
+
+def expected_data(entry: dict[str, Any] | list[Any]) -> Any:  # noqa: ANN401
+    """Return the data a key/value pair or list item will be read back as."""
+    data = builders.build_data(dumpers.dumps(entry))
+    return next(iter(data.values())) if isinstance(data, dict) else data[0]
+
+
+def edit(root: nodes.Root, start: int, end: int, new_text: str, check: Callable[[], bool]) -> None:
+    """Replace the text between `start` and `end`, undoing the edit if `check` finds it changed other values."""
+    old_text = root.document.text[start:end]
+    try:
+        root.apply_edit(start, end, new_text)
+    except ParseError as exc:
+        raise DumpError('Cannot make this edit without changing other values') from exc
+    try:
+        ok = check()
+    except (LookupError, TypeError):  # pragma: nocover
+        ok = False
+    if not ok:
+        root.apply_edit(start, start + len(new_text), old_text)
+        raise DumpError('Cannot make this edit without changing other values')
+
+
+def entries(parent: nodes.SymlNode) -> Sequence[nodes.SymlNode]:
+    """Return the key/value pairs or list items within the value of a root, key/value pair or list item."""
+    return parent.children[0].children if parent.children else ()
+
+
+def container_size(root: nodes.Root, path: Sequence[PathKey]) -> int:
+    """Return the number of entries in the list or mapping holding the entry at `path`."""
+    return len(entries(root.find(path[:-1])))
+
+
+def set_value(root: nodes.Root, path: Sequence[PathKey], value: Any) -> None:  # noqa: ANN401
+    """Set the value of the key or list item at `path`, adding the key to the end of its mapping if it is missing."""
+    if not path:
+        raise ValueError('Cannot set the whole document')
+    *parents, key = path
+    parent = root.find(parents)
+    wrapped: dict[str, Any] | list[Any] = [value] if isinstance(key, int) else {key: value}
+    expected = expected_data(wrapped)
+    size = container_size(root, path)
+    text = root.document.text
+    try:
+        entry = parent.entry(key)
+    except KeyError:
+        last = entries(parent)[-1]
+        pos = last.get_tip().end
+        indent = next_indent(text, last)
+        new_text = '\n' + indent + render(wrapped, lead_for(indent))
+        size += 1
+        start = end = pos
+    else:
+        new_text = render(wrapped, lead_for(text[line_start(text, entry.start) : entry.start]))
+        start, end = entry.start, entry.get_tip().end
+
+    def check() -> bool:
+        return container_size(root, path) == size and root.find(path).as_data() == expected
+
+    edit(root, start, end, new_text, check)
+
+
+def insert_value(root: nodes.Root, path: Sequence[PathKey], value: Any) -> None:  # noqa: ANN401
+    """Insert a list item before the index at the end of `path`, as `list.insert` does."""
+    parents, index = path[:-1], path[-1] if path else None
+    if not isinstance(index, int):
+        raise TypeError('Can only insert into a list at an index', path)
+    parent = root.find(parents)
+    if not isinstance(parent.children[0] if parent.children else None, nodes.List):
+        raise TypeError('Not a list', index)
+    items = entries(parent)
+    size = len(items)
+    index = max(0, min(index + size if index < 0 else index, size))
+    expected = expected_data([value])
+    text = root.document.text
+    if index < size:
+        item = items[index]
+        prefix = text[line_start(text, item.start) : item.start]
+        lead = lead_for(prefix)
+        indent = prefix if not prefix.strip() else ' ' * len(lead)
+        new_text = render([value], lead) + '\n' + indent
+        pos = item.start
+    else:
+        last = items[-1]
+        indent = next_indent(text, last)
+        new_text = '\n' + indent + render([value], lead_for(indent))
+        pos = last.get_tip().end
+    new_path = [*parents, index]
+
+    def check() -> bool:
+        return container_size(root, new_path) == size + 1 and root.find(new_path).as_data() == expected
+
+    edit(root, pos, pos, new_text, check)
+
+
+def delete_value(root: nodes.Root, path: Sequence[PathKey]) -> None:
+    """Remove the key or list item at `path`, with its lines."""
+    if not path:
+        raise ValueError('Cannot delete the whole document')
+    entry = root.find(path)
+    siblings: Sequence[nodes.SymlNode] = entry.parent.children  # type: ignore[union-attr]
+    size = len(siblings)
+    if size == 1:
+        raise DumpError('Cannot delete the only entry of a list or mapping', path)
+    text = root.document.text
+    start = line_start(text, entry.start)
+    if text[start : entry.start].strip():
+        # The entry shares its line with a list item's dash, so the entry after it takes its place there:
+        start, end = entry.start, siblings[1].start
+    else:
+        end = min(line_end(text, entry.get_tip().end) + 1, len(text))
+    # The lines around a deleted entry may be read back nested differently, so the whole top-level entry holding it,
+    # or the whole document for a top-level entry, is compared against what it should be without the deleted entry:
+    scope = path[:1] if len(path) > 1 else ()
+    expected = root.find(scope).as_data()
+    target = expected
+    for key in path[len(scope) : -1]:
+        target = target[key]
+    del target[path[-1]]
+    top_level = len(entries(root)) - (not scope)
+
+    def check() -> bool:
+        return len(entries(root)) == top_level and root.find(scope).as_data() == expected
+
+    edit(root, start, end, '', check)
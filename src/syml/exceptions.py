@@ -1,9 +1,29 @@
 """Exceptions for parsing SYML documents"""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: nocover
+    from .basetypes import StrPath
+
 
 class ParseError(ValueError):
-    """An error encountered while parsing"""
+    """An error encountered while parsing
+
+    `filename` is the file being parsed, where known.
+    """
+
+    filename: StrPath | None = None
 
 
 class OutOfContextNodeError(ParseError):
     """A node encountered in an illegal context"""
+
+
+class MalformedLineError(ParseError):
+    """A line that does not match the SYML grammar"""
+
+
+class DumpError(ValueError):
+    """A value that cannot be written as SYML"""
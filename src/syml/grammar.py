@@ -0,0 +1,196 @@
+"""The SYML grammar, and a parser built on it with parsimonious
+
+Only used by the `parsimonious` engine. Importing parsimonious and compiling the grammar take longer than most parses,
+so `syml.parsers` imports this module when the engine is first used, and the grammar is compiled on the first parse.
+"""
+
+from __future__ import annotations
+
+import textwrap
+import threading
+from typing import TYPE_CHECKING
+
+from parsimonious import Grammar, NodeVisitor
+from parsimonious.exceptions import ParseError as PParseError
+
+from . import nodes
+from .basetypes import Document
+from .exceptions import OutOfContextNodeError
+from .parsers import build_root
+from .scanner import malformed_line
+from .stats import phase
+
+if TYPE_CHECKING:  # pragma: nocover
+    from parsimonious.nodes import Node as PNode
+
+    from .basetypes import StrPath
+    from .nodes import OptionalNodes, OptionalSymlNodes, SymlNode, SymlNodes
+    from .stats import ParseStats
+
+GRAMMAR = textwrap.dedent(
+    r"""
+    lines       = line*
+    line        = indent (comment / blank / structure / value) &eol
+    structure   = list_item / key_value / section
+
+    indent      = ~"\s*"
+
+    blank       = &eol
+    comment     = ~"(#|//+)+" text?
+
+    list_item   = "-" ws value
+
+    key_value   = section ws data
+    section     = key ":"
+    key         = ~"[^\s:]+"
+
+    eol         = "\n" / ~"$"
+    ws          = ~"[ \t]+"
+    text        = ~".+"
+
+    value       = structure / data
+    data        = text
+    """
+)
+
+
+class ParseContext(threading.local):
+    """The document being parsed by a `SymlParser`, and its statistics, for each thread"""
+
+    document: Document
+    stats: ParseStats | None
+
+
+grammar_lock = threading.Lock()
+_grammar: Grammar | None = None
+
+
+def get_grammar() -> Grammar:
+    """Return the SYML grammar, compiled once on first use, even if several threads start parsing at the same time."""
+    global _grammar
+    if _grammar is None:
+        with grammar_lock:
+            if _grammar is None:
+                _grammar = Grammar(GRAMMAR)
+    return _grammar
+
+
+class SymlParser(NodeVisitor):  # type: ignore[type-arg]
+    """Parser for SYML
+
+    The document being parsed and its statistics are kept for each thread while it is visiting the parse tree, so a
+    single instance can be shared by any number of threads; `parsers.parse` uses `parser`.
+    """
+
+    unwrapped_exceptions = (OutOfContextNodeError,)
+
+    @property
+    def grammar(self) -> Grammar:  # type: ignore[override]
+        """Return the SYML grammar."""
+        return get_grammar()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.local = ParseContext()
+
+    @property
+    def document(self) -> Document:
+        """Return the document being parsed in this thread."""
+        return self.local.document
+
+    @property
+    def stats(self) -> ParseStats | None:
+        """Return the statistics of the parse in this thread, if any."""
+        return self.local.stats
+
+    def parse(
+        self, text: str, pos: int = 0, filename: StrPath | None = None, stats: ParseStats | None = None
+    ) -> nodes.Root:
+        """Parse a SYML document."""
+        try:
+            with phase(stats, 'match'):
+                tree = self.grammar.parse(text, pos=pos)
+        except PParseError as exc:
+            remainder = text[exc.pos :]
+            raise malformed_line(text, exc.pos + len(remainder) - len(remainder.lstrip())) from exc
+        self.local.document = Document(text, filename)
+        self.local.stats = stats
+        try:
+            with phase(stats, 'visit'):
+                return self.visit(tree)
+        finally:
+            del self.local.document, self.local.stats
+
+    def reduce_children(self, children: OptionalSymlNodes) -> SymlNodes:
+        """Return all non-null children."""
+        return [c for c in children if c is not None]
+
+    def visit_blank(self, node: PNode, children: SymlNodes) -> None:  # noqa: ARG002
+        """Visit a blank."""
+        return
+
+    def visit_line(self, node: PNode, children: SymlNodes) -> OptionalNodes:  # noqa: ARG002
+        """Visit a line."""
+        indent, value, _ = children
+        if value is not None:
+            value.set_level(indent.level)  # type: ignore[arg-type]
+            return value
+        return None
+
+    def generic_visit(self, node: PNode, children: OptionalSymlNodes) -> SymlNodes | SymlNode | None:  # type: ignore[override]  # noqa: ARG002
+        """Visit a generic node."""
+        nodes = self.reduce_children(children)
+        if not nodes:
+            return None
+        if len(nodes) == 1:
+            return nodes[0]
+        else:  # pragma: nocover  # noqa: RET505
+            return nodes
+
+    def visit_text(self, node: PNode, children: SymlNodes) -> nodes.TextLeafNode:  # noqa: ARG002
+        """Return a text leaf node."""
+        return nodes.TextLeafNode.from_pnode(node, self.document)
+
+    def visit_key(self, node: PNode, children: SymlNodes) -> nodes.KeyLeafNode:  # noqa: ARG002
+        """Return a key leaf node."""
+        return nodes.KeyLeafNode.from_pnode(node, self.document)
+
+    def visit_comment(self, node: PNode, children: OptionalSymlNodes) -> nodes.Comment:
+        """Visit a comment node."""
+        _, text = children
+        if text is None:
+            return nodes.Comment(document=self.document, start=node.end, end=node.end)
+        return nodes.Comment(document=self.document, start=text.start, end=text.end)
+
+    def visit_indent(self, node: PNode, children: SymlNodes) -> nodes.IndentNode:  # noqa: ARG002
+        """Visit an indentation token."""
+        _, _, indent = node.text.rpartition('\n')
+        return nodes.IndentNode.from_pnode(node, self.document, level=len(indent.replace('\t', ' ' * 4)))
+
+    def visit_key_value(self, node: PNode, children: SymlNodes) -> OptionalNodes:  # noqa: ARG002
+        """Visit a mapping value."""
+        section, _, value = children
+        section.incorporate_node(value)
+        return section
+
+    def visit_section(self, node: PNode, children: SymlNodes) -> nodes.KeyValue:
+        """Visit a key/value section."""
+        key, _ = children
+        return nodes.KeyValue.from_pnode(node, self.document, key=key)
+
+    def visit_list_item(self, node: PNode, children: SymlNodes) -> nodes.ListItem:
+        """Visit a list item."""
+        _, _, value = children
+        li = nodes.ListItem.from_pnode(node, self.document)
+        if value is not None:  # pragma: nobranch
+            li.incorporate_node(value)
+        return li
+
+    def visit_lines(self, node: PNode, children: OptionalSymlNodes) -> nodes.Root:
+        """Visit the lines within a SYML document."""
+        with phase(self.stats, 'incorporate'):
+            return build_root(nodes.Root.from_pnode(node, self.document), self.reduce_children(children))
+
+
+parser = SymlParser()
+"""The parser shared by every parse with the parsimonious engine"""
@@ -3,53 +3,143 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Callable, Iterator
+    from typing import Self
+
     from parsimonious.nodes import Node as PNode
 
-from .basetypes import Pos, Source, StrPath
+from .basetypes import Document, KeyPath, PathKey, Pos, Source, StrPath
 from .exceptions import OutOfContextNodeError
-from .utils import get_line
+from .utils import path_keys
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class SymlNode:
-    """A generic node in a SYML document."""
+    """A generic node in a SYML document.
+
+    Trees are built and converted with explicit stacks rather than recursion, so deeply nested documents cost no
+    Python frames per level and can't hit the recursion limit.
+
+    Nodes are slotted, and share their document's text and filename rather than holding their own. A node starts out
+    with the shared empty tuple for its children and comments, and only gets a list of its own once one is added, so
+    leaf nodes carry no empty lists.
+    """
 
-    pnode: PNode = field(repr=False)
+    leaf: ClassVar[bool] = False
+
+    document: Document = field(repr=False)
+    start: int = field(repr=False)
+    end: int = field(repr=False)
     level: int | None = field(default=None)
     parent: SymlNode | None = field(default=None)
-    comments: list[Comment] = field(default_factory=list)
-    children: list[SymlNode] = field(default_factory=list)
-    filename: StrPath | None = field(default=None)
-
-    source: Source = field(init=False)
+    comments: list[Comment] | tuple[()] = field(default=())
+    children: list[SymlNode] | tuple[()] = field(default=())
 
     def __post_init__(self) -> None:
-        self.source = Source.from_node(self.pnode, filename=self.filename)
         if self.level is not None:
             self.set_level(self.level)
 
+    @property
+    def full_text(self) -> str:
+        """Return the text of the whole document."""
+        return self.document.text
+
+    @property
+    def filename(self) -> StrPath | None:
+        """Return the name of the file the document came from."""
+        return self.document.filename
+
+    @property
+    def text(self) -> str:
+        """Return the text spanned by this node."""
+        return self.document.text[self.start : self.end]
+
+    @property
+    def source(self) -> Source:
+        """Return a Source object for the text spanned by this node.
+
+        Line and column positions are only worked out when asked for, so nodes only ever converted to primitive data
+        never pay for them.
+        """
+        document = self.document
+        return Source.from_span(document.text, self.start, self.end, filename=document.filename, lines=document.lines)
+
+    @classmethod
+    def from_pnode(cls, pnode: PNode, document: Document, **kwargs: Any) -> Self:  # noqa: ANN401
+        """Build a node spanning the text matched by the given parsimonious node."""
+        return cls(document=document, start=pnode.start, end=pnode.end, **kwargs)
+
     def set_level(self, level: int) -> None:
-        """Set this node's level."""
-        self.level = level
-        for child in self.children:
-            child.set_level(level)
+        """Set the level of this node and all of its descendants."""
+        stack: list[SymlNode] = [self]
+        while stack:
+            node = stack.pop()
+            node.level = level
+            stack.extend(node.children)
 
-    def as_data(self) -> Any:  # noqa: ANN401  # pragma: nocover
+    def as_data(self) -> Any:  # noqa: ANN401
         """Return this node as primitive data types."""
-        raise NotImplementedError
+        return self.fold(lambda node, values: node.data_from_children(values))
 
-    def as_source(self) -> Any:  # noqa: ANN401  # pragma: nocover
+    def as_source(self) -> Any:  # noqa: ANN401
         """Return this node as primitive data types with Source objects for strings."""
+        return self.fold(lambda node, values: node.source_from_children(values))
+
+    def data_from_children(self, values: list[Any]) -> Any:  # noqa: ANN401  # pragma: nocover
+        """Return this node as primitive data types, given its children as primitive data types."""
         raise NotImplementedError
 
+    def source_from_children(self, values: list[Any]) -> Any:  # noqa: ANN401  # pragma: nocover
+        """Return this node as primitive data types with Source objects for strings, given its children as such."""
+        raise NotImplementedError
+
+    def fold(self, build: Callable[[SymlNode, list[Any]], Any]) -> Any:  # noqa: ANN401
+        """Build a value for this node from the values built for its children, working up from the leaves.
+
+        The children of leaf nodes are left for the leaf to deal with.
+        """
+        results: list[list[Any]] = [[]]
+        stack: list[tuple[SymlNode, bool]] = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                values = results.pop()
+                results[-1].append(build(node, values))
+            elif node.leaf or not node.children:
+                results[-1].append(build(node, []))
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+                results.append([])
+        return results[0][0]
+
+    def walk(self) -> Iterator[SymlNode]:
+        """Yield this node and all of its descendants, depth first."""
+        stack: list[SymlNode] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def shift(self, offset: int) -> None:
+        """Move this node and all of its descendants, with their keys and comments, `offset` characters along."""
+        for node in self.walk():
+            moved: list[SymlNode] = [node, *node.comments]
+            if isinstance(node, KeyValue):
+                moved.append(node.key)
+            for each in moved:
+                each.start += offset
+                each.end += offset
+
     def get_tip(self) -> SymlNode:
         """Return the tip of this branch."""
-        if self.children:
-            return self.children[-1].get_tip()
-        return self
+        node = self
+        while node.children:
+            node = node.children[-1]
+        return node
 
     def can_add_node(self, node: SymlNode) -> bool:  # noqa: ARG002  # pragma: nocover
         """Check if this node can add a child node."""
@@ -57,34 +147,52 @@ class SymlNode:
 
     def add_node(self, node: SymlNode) -> SymlNode:
         """Add a child node."""
-        self.children.append(node)
+        if isinstance(self.children, list):
+            self.children.append(node)
+        else:
+            self.children = [node]
         node.parent = self
         if node.level is None:
             node.set_level(self.level)  # type: ignore[arg-type]
         return node.get_tip()
 
+    def add_comment(self, comment: Comment) -> None:
+        """Attach a comment to this node."""
+        if isinstance(self.comments, list):
+            self.comments.append(comment)
+        else:
+            self.comments = [comment]
+
+    def insert_node(self, node: SymlNode) -> SymlNode:
+        """Add a child node that this node has agreed to take, returning the new tip of the branch."""
+        return self.add_node(node)
+
     def incorporate_node(self, node: SymlNode) -> SymlNode:
-        """Incorporate the given node into the tree somewhere nearby."""
-        if self.can_add_node(node):
-            return self.add_node(node)
-        if self.parent is not None:
-            return self.parent.incorporate_node(node)
-        else:  # pragma: nocover  # noqa: RET505
-            # Shouldn't ever get here:
-            self.fail_to_incorporate_node(node)
-            return self  # pragma: nocover
+        """Incorporate the given node into the tree somewhere nearby.
+
+        Climbs from this node towards the root until reaching a node that can take it.
+        """
+        ancestor: SymlNode | None = self
+        while ancestor is not None:
+            if ancestor.can_add_node(node):
+                return ancestor.insert_node(node)
+            ancestor = ancestor.parent
+        self.fail_to_incorporate_node(node)
+        return self  # pragma: nocover
 
     def fail_to_incorporate_node(self, node: SymlNode) -> None:
         """Report a failure to incorporate a node."""
-        pnode = node.pnode
-        pos = Pos.from_str_index(pnode.full_text, pnode.start)
-        line = get_line(pnode.full_text, pos.line)
+        document = node.document
+        pos = Pos.from_str_index(document.text, node.start, document.lines)
+        line = document.lines.get_line(document.text, pos.line)
         raise OutOfContextNodeError('Failed to incorporate a node', pos, line)
 
 
 class IndentNode(SymlNode):
     """A node representing an indentation."""
 
+    __slots__ = ()
+
 
 SymlNodes = list[SymlNode]
 OptionalSymlNodes = list[SymlNode | None]
@@ -94,48 +202,48 @@ NodeOrNodes = SymlNodes | SymlNode | str
 OptionalNodes = NodeOrNodes | None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ContainerNode(SymlNode):
     """A container node that may contain a child value."""
 
-    def as_source(self) -> Any:  # noqa: ANN401  # pragma: nocover
-        """Return this node as primitive data types with Source objects for strings."""
-        if self.children:
-            return self.children[0].as_source()
-        return None  # pragma: nocover
+    def source_from_children(self, values: list[Any]) -> Any:  # noqa: ANN401
+        """Return the container's child with Source objects for strings."""
+        return values[0] if values else None
 
-    def as_data(self) -> Any:  # noqa: ANN401
-        """Return the container as primitive data types."""
-        if self.children:
-            return self.children[0].as_data()
-        return None  # pragma: nocover
+    def data_from_children(self, values: list[Any]) -> Any:  # noqa: ANN401
+        """Return the container's child as primitive data types."""
+        return values[0] if values else None
 
-    def incorporate_node(self, node: SymlNode) -> SymlNode:
-        """Incorporate the given node into this branch."""
-        if self.can_add_node(node):
-            intermediary: SymlNode | None = None
-            if isinstance(node, KeyValue):
-                intermediary = Mapping(pnode=node.pnode, level=self.level, filename=self.filename)
-            elif isinstance(node, ListItem):
-                intermediary = List(pnode=node.pnode, level=self.level, filename=self.filename)
-
-            if intermediary is not None:
-                intermediary.set_level(node.level)  # type: ignore[arg-type]
-                intermediary = self.incorporate_node(intermediary)
-                return intermediary.incorporate_node(node)
-            return super().incorporate_node(node)
-        if self.parent is not None:
-            return self.parent.incorporate_node(node)
-        else:  # pragma: nocover  # noqa: RET505
-            self.fail_to_incorporate_node(node)
-            return self
+    def insert_node(self, node: SymlNode) -> SymlNode:
+        """Add a child node, wrapping a key/value pair in a mapping and a list item in a list."""
+        intermediary: SymlNode | None = None
+        if isinstance(node, KeyValue):
+            intermediary = Mapping(document=node.document, start=node.start, end=node.end, level=node.level)
+        elif isinstance(node, ListItem):
+            intermediary = List(document=node.document, start=node.start, end=node.end, level=node.level)
+
+        if intermediary is not None:
+            self.add_node(intermediary)
+            return intermediary.add_node(node)
+        return self.add_node(node)
 
     def can_add_node(self, node: SymlNode) -> bool:
         """Check if this container can add a child node."""
         return not self.children and (node.level is None or (self.level is not None and node.level > self.level))
 
+    def entry(self, key: PathKey) -> SymlNode:
+        """Return the key/value pair for a key, or the list item at an index, within this container's value."""
+        value = self.children[0] if self.children else None
+        if isinstance(key, str):
+            if not isinstance(value, Mapping):
+                raise TypeError('Not a mapping', key)
+            return value.entry(key)
+        if not isinstance(value, List):
+            raise TypeError('Not a list', key)
+        return value.children[key]
 
-@dataclass(kw_only=True)
+
+@dataclass(kw_only=True, slots=True)
 class ParentNode(SymlNode):
     """A parent node that con have multiple children"""
 
@@ -143,83 +251,163 @@ class ParentNode(SymlNode):
         """Check if a child node can be added."""
         return node.level is None or (self.level is not None and node.level >= self.level)
 
-    def add_node(self, node: SymlNode) -> SymlNode:
-        """Add a child node."""
-        self.children.append(node)
-        node.parent = self
-        if node.level is None:
-            node.set_level(self.level)  # type: ignore[arg-type]
-        return node.get_tip()
-
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Root(ContainerNode):
     """A root container node for a SYML document"""
 
     level: int = field(default=0)
 
+    def find(self, path: KeyPath) -> ContainerNode:
+        """Return the key/value pair or list item at `path`, or the root itself for an empty path.
+
+        A path is a string like `services.web.ports[0]`, or a sequence of keys and list indices. Keys are looked up in
+        each mapping's index, so nothing but the path is visited. Raises KeyError, IndexError or TypeError if there is
+        no such entry.
+        """
+        node: ContainerNode = self
+        for key in path_keys(path):
+            node = node.entry(key)  # type: ignore[assignment]
+        return node
+
+    def get(self, path: KeyPath) -> Any:  # noqa: ANN401
+        """Return the value at `path` as primitive data types, without converting anything around it."""
+        return self.find(path).as_data()
+
+    def get_source(self, path: KeyPath) -> Any:  # noqa: ANN401
+        """Return the value at `path` as primitive data types with Source objects for strings."""
+        return self.find(path).as_source()
+
+    def index(self) -> None:
+        """Index the keys of every mapping in the document up front, rather than on the first lookup in each."""
+        for node in self.walk():
+            if isinstance(node, Mapping):
+                node.index()
+
+    def apply_edit(self, start: int, end: int, new_text: str) -> None:
+        """Replace the text between `start` and `end` of the document with `new_text`, updating the tree to match.
+
+        Only the top-level entries whose lines the edit touches are parsed again; the rest are kept, and those after
+        the edit are moved along. The tree is left as it was if the edited document fails to parse.
+        """
+        from .parsers import fast_parser
+
+        fast_parser.apply_edit(self, start, end, new_text)
+
     def can_add_node(self, node: SymlNode) -> bool:
         """Check if a child node may be added."""
         return not self.children and (node.level is None or (self.level is not None and node.level >= self.level))
 
+    def set(self, path: KeyPath, value: Any) -> None:  # noqa: ANN401
+        """Set the value of the key or list item at `path`, given as for `find`.
+
+        A missing key is added to the end of its mapping. Only the lines of the key or list item are written again,
+        and the rest of the document is kept as it was, comments and formatting included. DumpError is raised, and
+        the document left as it was, if the value cannot be written there without changing the values around it.
+        """
+        from .editors import set_value
+
+        set_value(self, path_keys(path), value)
+
+    def insert(self, path: KeyPath, value: Any) -> None:  # noqa: ANN401
+        """Insert a list item before the index at the end of `path`, keeping the rest of the document as it was."""
+        from .editors import insert_value
+
+        insert_value(self, path_keys(path), value)
+
+    def delete(self, path: KeyPath) -> None:
+        """Remove the key or list item at `path` and its lines, keeping the rest of the document as it was."""
+        from .editors import delete_value
+
+        delete_value(self, path_keys(path))
+
 
 class List(ParentNode):
     """A list node"""
 
+    __slots__ = ()
+
     def can_add_node(self, node: SymlNode) -> bool:
         """Check if a child node can be added."""
         return super().can_add_node(node) and isinstance(node, ListItem)
 
-    def as_source(self) -> Any:  # noqa: ANN401  # pragma: nocover
-        """Return this node as primitive data types with Source objects for strings."""
-        return [c.as_source() for c in self.children]
+    def source_from_children(self, values: list[Any]) -> list[Any]:
+        """Return the list's items with Source objects for strings."""
+        return values
 
-    def as_data(self) -> list[Any]:
-        """Return this node as primitive data types."""
-        return [c.as_data() for c in self.children]
+    def data_from_children(self, values: list[Any]) -> list[Any]:
+        """Return the list's items as primitive data types."""
+        return values
 
 
 class ListItem(ContainerNode):
     """A list item within a list."""
 
+    __slots__ = ()
+
 
+@dataclass(kw_only=True, slots=True)
 class Mapping(ParentNode):
-    """A mapping of keys to values"""
+    """A mapping of keys to values
+
+    The key/value pairs are indexed by key on the first lookup, and the index is dropped whenever one is added.
+    """
+
+    lookup: dict[str, KeyValue] | None = field(default=None, repr=False, compare=False)
+
+    def add_node(self, node: SymlNode) -> SymlNode:
+        """Add a child node, dropping the index of keys."""
+        self.lookup = None
+        return ParentNode.add_node(self, node)
+
+    def index(self) -> dict[str, KeyValue]:
+        """Return the key/value pairs by key, building the index if needed. Later keys win, as in `as_data`."""
+        if self.lookup is None:
+            self.lookup = {child.key.text: child for child in self.children}  # type: ignore[attr-defined, misc]
+        return self.lookup
+
+    def entry(self, key: str) -> KeyValue:
+        """Return the key/value pair for a key."""
+        return self.index()[key]
 
     def can_add_node(self, node: SymlNode) -> bool:
         """Check if a child node may be added."""
-        return super().can_add_node(node) and isinstance(node, KeyValue)
+        return ParentNode.can_add_node(self, node) and isinstance(node, KeyValue)
 
-    def as_source(self) -> Any:  # noqa: ANN401  # pragma: nocover
-        """Return this node as primitive data types with Source objects for strings."""
-        return {c.key.as_source(): c.as_source() for c in self.children}  # type: ignore[attr-defined]
+    def source_from_children(self, values: list[Any]) -> dict[Source, Any]:
+        """Return the mapping's items with Source objects for strings."""
+        return {c.key.key: v for c, v in zip(self.children, values, strict=True)}  # type: ignore[attr-defined]
 
-    def as_data(self) -> dict[str, Any]:
-        """Return this node as primitive data types."""
-        return {c.key.as_data(): c.as_data() for c in self.children}  # type: ignore[attr-defined]
+    def data_from_children(self, values: list[Any]) -> dict[str, Any]:
+        """Return the mapping's items as primitive data types."""
+        return {c.key.text: v for c, v in zip(self.children, values, strict=True)}  # type: ignore[attr-defined]
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class KeyValue(ContainerNode):
     """A key-value item within a mapping"""
 
     key: KeyLeafNode
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class TextLeafNode(SymlNode):
-    """A leaf node containing a text value."""
+    """A leaf node containing a text value.
 
-    def as_source(self) -> Source:  # pragma: nocover
-        """Return this node as primitive data types with Source objects for strings."""
-        source = self.source
-        for child in self.children:
-            source += child.as_source()
-        return source
+    Each continuation line of the text is a child of the line before it.
+    """
+
+    leaf: ClassVar[bool] = True
+
+    def source_from_children(self, values: list[Any]) -> Source:  # noqa: ARG002
+        """Return the whole text, continuation lines included, as a Source object."""
+        spans = [(node.start, node.end) for node in self.walk()]
+        document = self.document
+        return Source.from_spans(document.text, spans, filename=document.filename, lines=document.lines)
 
-    def as_data(self) -> str:
-        """Return this node as primitive types."""
-        return '\n'.join([str(self.source)] + [c.as_data() for c in self.children])
+    def data_from_children(self, values: list[Any]) -> str:  # noqa: ARG002
+        """Return the whole text, continuation lines included."""
+        return '\n'.join(node.text for node in self.walk())
 
     def can_add_node(self, node: SymlNode) -> bool:
         """Check if a child node can be added."""
@@ -229,6 +417,10 @@ class TextLeafNode(SymlNode):
 class KeyLeafNode(SymlNode):
     """A leaf node containing a key value."""
 
+    __slots__ = ()
+
+    leaf: ClassVar[bool] = True
+
     def can_add_node(self, node: SymlNode) -> bool:  # noqa: ARG002  # pragma: nocover
         """Check if this node can add a child. It can't."""
         return False
@@ -236,21 +428,23 @@ class KeyLeafNode(SymlNode):
     @property
     def key(self) -> Source:
         """Return a Source object representing the key."""
-        return Source.from_node(self.pnode, filename=self.filename)
+        return self.source
 
-    def as_source(self) -> Any:  # noqa: ANN401  # pragma: nocover
-        """Return this node as primitive data types with Source objects for strings."""
+    def source_from_children(self, values: list[Any]) -> Source:  # noqa: ARG002
+        """Return the key as a Source object."""
         return self.key
 
-    def as_data(self) -> str:
+    def data_from_children(self, values: list[Any]) -> str:  # noqa: ARG002
         """Return the key as a string."""
-        return str(self.key)
+        return self.text
 
 
 class Comment(TextLeafNode):
     """A comment node"""
 
-    def as_data(self) -> str:  # pragma: nocover
+    __slots__ = ()
+
+    def data_from_children(self, values: list[Any]) -> str:  # noqa: ARG002  # pragma: nocover
         """Return an empty string."""
         return ''
 
@@ -2,135 +2,270 @@
 
 from __future__ import annotations
 
-import textwrap
-from typing import TYPE_CHECKING
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, NamedTuple
 
-from parsimonious import Grammar, NodeVisitor
-
-from . import nodes
-from .exceptions import OutOfContextNodeError
+from . import builders, nodes, scanner
+from .basetypes import Document
+from .exceptions import ParseError
+from .stats import ParseStats, collector, notify
 
 if TYPE_CHECKING:  # pragma: nocover
-    from parsimonious.nodes import Node as PNode
+    from collections.abc import Iterable, Iterator
 
     from .basetypes import StrPath
-    from .nodes import OptionalNodes, OptionalSymlNodes, SymlNode, SymlNodes
-
-
-class SymlParser(NodeVisitor):  # type: ignore[type-arg]
-    """Parser for SYML"""
-
-    grammar = Grammar(
-        textwrap.dedent(
-            r"""
-            lines       = line*
-            line        = indent (comment / blank / structure / value) &eol
-            structure   = list_item / key_value / section
-
-            indent      = ~"\s*"
-
-            blank       = &eol
-            comment     = ~"(#|//+)+" text?
-
-            list_item   = "-" ws value
-
-            key_value   = section ws data
-            section     = key ":"
-            key         = ~"[^\s:]+"
-
-            eol         = "\n" / ~"$"
-            ws          = ~"[ \t]+"
-            text        = ~".+"
-
-            value       = structure / data
-            data        = text
-
-            """
-        )
-    )
-    unwrapped_exceptions = (OutOfContextNodeError,)
-
-    def __init__(self, filename: StrPath | None = None) -> None:
-        super().__init__()
-        self.filename = filename
-
-    def reduce_children(self, children: OptionalSymlNodes) -> SymlNodes:
-        """Return all non-null children."""
-        return [c for c in children if c is not None]
-
-    def visit_blank(self, node: PNode, children: SymlNodes) -> None:  # noqa: ARG002
-        """Visit a blank."""
-        return
-
-    def visit_line(self, node: PNode, children: SymlNodes) -> OptionalNodes:  # noqa: ARG002
-        """Visit a line."""
-        indent, value, _ = children
-        if value is not None:
-            value.set_level(indent.level)  # type: ignore[arg-type]
-            return value
-        return None
-
-    def generic_visit(self, node: PNode, children: OptionalSymlNodes) -> SymlNodes | SymlNode | None:  # type: ignore[override]  # noqa: ARG002
-        """Visit a generic node."""
-        nodes = self.reduce_children(children)
-        if not nodes:
+    from .grammar import SymlParser as SymlParser
+    from .nodes import SymlNode
+
+
+Engine = Literal['parsimonious', 'fast']
+
+
+def build_root(root: nodes.Root, line_nodes: Iterable[SymlNode]) -> nodes.Root:
+    """Incorporate the nodes parsed from each line of a document into its root."""
+    incorporate_lines(root, line_nodes)
+    return root
+
+
+def incorporate_lines(current: SymlNode, line_nodes: Iterable[SymlNode]) -> SymlNode:
+    """Incorporate the nodes parsed from each line of a document, starting from `current`, returning the new tip."""
+    for child in line_nodes:
+        if isinstance(child, nodes.Comment):
+            current.add_comment(child)
+        else:
+            current = current.incorporate_node(child)
+    return current
+
+
+def line_start(text: str, index: int) -> int:
+    """Return the index of the start of the line containing `index`."""
+    return text.rfind('\n', 0, index) + 1
+
+
+class Region(NamedTuple):
+    """The top-level entries of a document affected by an edit, and the span of their lines"""
+
+    container: nodes.List | nodes.Mapping
+    entries: list[SymlNode]
+    first: int
+    after: int
+    start: int
+    end: int
+
+
+class FastSymlParser:
+    """Hand-written line scanner for SYML
+
+    SYML is strictly line-based, so each line is matched on its own without building a parse tree for the whole
+    document. The resulting tree is identical to the one built by `SymlParser`.
+
+    A parser holds no state between parses, so a single instance can be shared by any number of threads; `parse` uses
+    `fast_parser`.
+    """
+
+    node_classes: ClassVar[dict[str, type[SymlNode]]] = {
+        scanner.LIST_ITEM: nodes.ListItem,
+        scanner.TEXT: nodes.TextLeafNode,
+        scanner.COMMENT: nodes.Comment,
+    }
+
+    def parse(self, text: str, filename: StrPath | None = None, stats: ParseStats | None = None) -> nodes.Root:
+        """Parse a SYML document.
+
+        When collecting statistics, the time spent scanning, building and incorporating each line is added up in a
+        phase of its own.
+        """
+        document = Document(text, filename)
+        root = nodes.Root(document=document, start=0, end=len(text))
+        if stats is None:
+            return build_root(root, self.build_lines(document))
+        with stats.phase('incorporate'):
+            lines = stats.timed(scanner.scan_lines(text), 'scan')
+            return build_root(root, stats.timed((self.build_line(document, line) for line in lines), 'build'))
+
+    def build_line(self, document: Document, line: scanner.Line) -> SymlNode:
+        """Build the node for a scanned line, with the nodes for its nested elements within it."""
+        outermost, *nested = line.elements
+        value = tip = self.build_element(document, outermost)
+        for element in nested:
+            tip = tip.incorporate_node(self.build_element(document, element))
+        value.set_level(line.level)
+        return value
+
+    def build_element(self, document: Document, element: scanner.Element) -> SymlNode:
+        """Build the node for a single element of a line."""
+        kind, start, end = element
+        if kind == scanner.KEY_VALUE:
+            key = nodes.KeyLeafNode(document=document, start=start, end=end - 1)
+            return nodes.KeyValue(document=document, start=start, end=end, key=key)
+        return self.node_classes[kind](document=document, start=start, end=end)
+
+    def build_lines(self, document: Document, start: int = 0, end: int | None = None) -> Iterator[SymlNode]:
+        """Build the nodes for the lines of a document, or for the lines between `start` and `end`."""
+        return (self.build_line(document, line) for line in scanner.scan_lines(document.text, start, end))
+
+    def apply_edit(self, root: nodes.Root, start: int, end: int, new_text: str) -> None:
+        """Replace the text between `start` and `end` of a parsed document with `new_text`, updating its tree.
+
+        The lines of the top-level entries touched by the edit are parsed again, starting from the top-level list or
+        mapping, as the entry before them leaves it. If the entry after them would no longer be added to that list or
+        mapping, or the edit touches the first line of the first entry, the whole document is parsed again instead.
+        """
+        document = root.document
+        old_text = document.text
+        if not 0 <= start <= end <= len(old_text):
+            raise ValueError('Edit out of range', start, end)
+        region = self.find_region(root, start, end)
+        document.text = f'{old_text[:start]}{new_text}{old_text[end:]}'
+        try:
+            if region is None or not self.reparse_region(region, len(new_text) - (end - start)):
+                self.reparse(root)
+        except ParseError:
+            document.text = old_text
+            raise
+        root.end = len(document.text)
+
+    def find_region(self, root: nodes.Root, start: int, end: int) -> Region | None:
+        """Find the top-level entries whose lines are touched by an edit between `start` and `end`.
+
+        The region starts at the last entry whose first line ends before the edit, and runs up to the first entry
+        whose line starts after it.
+        """
+        container = root.children[0] if root.children else None
+        if not isinstance(container, nodes.List | nodes.Mapping) or not isinstance(container.children, list):
+            return None
+        text = root.document.text
+        entries = container.children
+        first = bisect_left(entries, start, key=attrgetter('start')) - 1
+        while first >= 0 and not 0 <= text.find('\n', entries[first].start) < start:
+            first -= 1
+        if first < 0:
             return None
-        if len(nodes) == 1:
-            return nodes[0]
-        else:  # pragma: nocover  # noqa: RET505
-            return nodes
-
-    def visit_text(self, node: PNode, children: SymlNodes) -> nodes.TextLeafNode:  # noqa: ARG002
-        """Return a text leaf node."""
-        return nodes.TextLeafNode(pnode=node, filename=self.filename)
-
-    def visit_key(self, node: PNode, children: SymlNodes) -> nodes.KeyLeafNode:  # noqa: ARG002
-        """Return a key leaf node."""
-        return nodes.KeyLeafNode(pnode=node, filename=self.filename)
-
-    def visit_comment(self, node: PNode, children: SymlNodes) -> nodes.Comment:  # noqa: ARG002
-        """Visit a comment node."""
-        _, text = children
-        return nodes.Comment(pnode=text.pnode, filename=self.filename)
-
-    def visit_indent(self, node: PNode, children: SymlNodes) -> nodes.IndentNode:  # noqa: ARG002
-        """Visit an indentation token."""
-        return nodes.IndentNode(
-            pnode=node, level=len(node.text.replace('\t', ' ' * 4).strip('\n')), filename=self.filename
-        )
-
-    def visit_key_value(self, node: PNode, children: SymlNodes) -> OptionalNodes:  # noqa: ARG002
-        """Visit a mapping value."""
-        section, _, value = children
-        section.incorporate_node(value)
-        return section
-
-    def visit_section(self, node: PNode, children: SymlNodes) -> nodes.KeyValue:
-        """Visit a key/value section."""
-        key, _ = children
-        return nodes.KeyValue(pnode=node, key=key, filename=self.filename)  # type: ignore[arg-type]
-
-    def visit_list_item(self, node: PNode, children: SymlNodes) -> nodes.ListItem:
-        """Visit a list item."""
-        _, _, value = children
-        li = nodes.ListItem(pnode=node, filename=self.filename)
-        if value is not None:  # pragma: nobranch
-            li.incorporate_node(value)
-        return li
-
-    def visit_lines(self, node: PNode, children: OptionalSymlNodes) -> nodes.Root:
-        """Visit the lines within a SYML document."""
-        root = nodes.Root(pnode=node, filename=self.filename)
-        current: SymlNode = root
-
-        for child in self.reduce_children(children):
-            if isinstance(child, nodes.Comment):
-                current.comments.append(child)
-            else:
-                current = current.incorporate_node(child)
-        return root
-
-
-def parse(source_syml: str, filename: StrPath | None = None) -> nodes.Root:
-    """Parse a SYML document."""
-    return SymlParser(filename=filename).parse(source_syml)
+        after = bisect_right(entries, end, key=attrgetter('start'))
+        while after < len(entries) and line_start(text, entries[after].start) <= end:
+            after += 1
+        region_end = line_start(text, entries[after].start) if after < len(entries) else len(text)
+        return Region(container, entries, first, after, line_start(text, entries[first].start), region_end)
+
+    def reparse_region(self, region: Region, offset: int) -> bool:
+        """Parse the lines of a region again, once the document has been edited, moving the entries after it along.
+
+        Returns False, leaving the tree as it was, if the entry after the region would no longer follow on from it.
+        """
+        container, entries, first, after = region.container, region.entries, region.first, region.after
+        removed = entries[first:]
+        tail = entries[after:]
+        end = region.end + offset if tail else None
+        del entries[first:]
+        if isinstance(container, nodes.Mapping):
+            container.lookup = None
+        try:
+            tip = incorporate_lines(container, self.build_lines(container.document, region.start, end))
+        except ParseError:
+            entries[first:] = removed
+            raise
+        if tail and self.climb(tip, tail[0]) is not container:
+            entries[first:] = removed
+            return False
+        entries.extend(tail)
+        for entry in tail:
+            entry.shift(offset)
+        return True
+
+    def climb(self, tip: SymlNode, node: SymlNode) -> SymlNode | None:
+        """Find the node that would take `node`, climbing from `tip`, without adding it."""
+        ancestor: SymlNode | None = tip
+        while ancestor is not None and not ancestor.can_add_node(node):
+            ancestor = ancestor.parent
+        return ancestor
+
+    def reparse(self, root: nodes.Root) -> None:
+        """Parse the whole of an edited document again into its root."""
+        children, comments = root.children, root.comments
+        root.children = root.comments = ()
+        try:
+            build_root(root, self.build_lines(root.document))
+        except ParseError:
+            root.children, root.comments = children, comments
+            raise
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import `SymlParser` when it is first used, as parsimonious and its grammar are slow to load."""
+    if name == 'SymlParser':
+        from .grammar import SymlParser
+
+        return SymlParser
+    raise AttributeError(name)
+
+
+fast_parser = FastSymlParser()
+"""The parser shared by every parse with the fast engine"""
+
+
+def get_parser(engine: Engine) -> SymlParser | FastSymlParser:
+    """Return the shared parser for an engine."""
+    if engine == 'fast':
+        return fast_parser
+    if engine == 'parsimonious':
+        from .grammar import parser
+
+        return parser
+    raise ValueError('Unknown parser engine', engine)
+
+
+def build_tree(source_syml: str, filename: StrPath | None, engine: Engine, stats: ParseStats | None) -> nodes.Root:
+    """Parse a SYML document into a tree, filling in statistics of the parse if given."""
+    parser = get_parser(engine)
+    if stats is None:
+        return parser.parse(source_syml, filename=filename)
+    stats.start(source_syml, filename, engine)
+    root = parser.parse(source_syml, filename=filename, stats=stats)
+    stats.count_tree(root)
+    return root
+
+
+def parse(
+    source_syml: str, filename: StrPath | None = None, engine: Engine = 'fast', stats: ParseStats | None = None
+) -> nodes.Root:
+    """Parse a SYML document.
+
+    Given a `ParseStats`, the parse is timed and measured into it; see `syml.stats`.
+    """
+    stats = collector(stats)
+    root = build_tree(source_syml, filename, engine, stats)
+    if stats is not None:
+        notify(stats)
+    return root
+
+
+def parse_data(
+    source_syml: str,
+    filename: StrPath | None = None,
+    engine: Engine = 'fast',
+    stats: ParseStats | None = None,
+    strings: builders.StringTable | None = None,
+) -> Any:  # noqa: ANN401
+    """Parse a SYML document into primitive data types.
+
+    The fast engine builds the data directly from the scanned lines, never building the node tree. Only the fast
+    engine can share equal strings through a `builders.StringTable`.
+    """
+    if strings is not None and engine != 'fast':
+        raise ValueError('Only the fast engine can share strings', engine)
+    stats = collector(stats)
+    if stats is None:
+        if engine == 'fast':
+            return builders.build_data(source_syml, strings=strings)
+        return build_tree(source_syml, filename, engine, None).as_data()
+
+    if engine == 'fast':
+        stats.start(source_syml, filename, engine)
+        data = builders.build_data(source_syml, stats, strings)
+    else:
+        root = build_tree(source_syml, filename, engine, stats)
+        with stats.phase('as_data'):
+            data = root.as_data()
+    notify(stats)
+    return data
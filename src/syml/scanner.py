@@ -0,0 +1,121 @@
+"""Line scanner for SYML documents
+
+SYML is strictly line-based, so each line can be matched on its own, without building a parse tree for the whole
+document. The scanner breaks each non-blank line into a chain of elements, each nested within the one before it.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+from .basetypes import Pos
+from .exceptions import MalformedLineError
+from .utils import LineIndex
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Iterator
+
+
+LIST_ITEM = 'list_item'
+KEY_VALUE = 'key_value'
+TEXT = 'text'
+COMMENT = 'comment'
+
+COMMENT_RE = re.compile(r'(?:#|//+)+')
+SECTION_RE = re.compile(r'[^\s:]+:')
+WS_RE = re.compile(r'[ \t]+')
+
+
+class Element(NamedTuple):
+    """A structural element of a line
+
+    A list item spans from its dash to the end of its value, a key/value pair spans its key and colon, and text and
+    comments span their text.
+    """
+
+    kind: str
+    start: int
+    end: int
+
+
+class Line(NamedTuple):
+    """A non-blank line of a SYML document"""
+
+    level: int
+    start: int
+    end: int
+    elements: list[Element]
+
+
+def malformed_line(text: str, index: int) -> MalformedLineError:
+    """Build an error reporting the malformed line found at `index`."""
+    lines = LineIndex.from_text(text)
+    pos = Pos.from_str_index(text, index, lines)
+    return MalformedLineError('Failed to parse a line', pos, lines.get_line(text, pos.line))
+
+
+def scan_lines(text: str, start: int = 0, end: int | None = None) -> Iterator[Line]:
+    """Yield each non-blank line of the document, or of the lines between `start` and `end`."""
+    for line in text[start:end].split('\n'):
+        content = line.lstrip()
+        if content:
+            indent = len(line) - len(content)
+            yield Line(
+                len(line[:indent].replace('\t', ' ' * 4)),
+                start + indent,
+                start + len(line),
+                scan_line(text, start + indent, start + len(line)),
+            )
+        start += len(line) + 1
+
+
+def scan_line(text: str, pos: int, end: int) -> list[Element]:
+    """Scan the content of the line between `pos` and `end`."""
+    match = COMMENT_RE.match(text, pos, end)
+    if match is not None:
+        return [Element(COMMENT, match.end(), end)]
+    elements: list[Element] = []
+    stop = scan_structure(text, pos, end, elements)
+    if stop is None:
+        return [Element(TEXT, pos, end)]
+    if stop != end:
+        raise malformed_line(text, pos)
+    return elements
+
+
+def scan_structure(text: str, pos: int, end: int, elements: list[Element]) -> int | None:
+    """Scan a list item, key/value pair or section into `elements`, returning where it stops.
+
+    A list item's value may itself be a list item, so the dashes of nested list items are consumed in a loop.
+    """
+    items: list[int] = []
+    value = pos
+    while text.startswith('-', value, end):
+        ws = WS_RE.match(text, value + 1, end)
+        if ws is None:
+            break
+        items.append(value)
+        value = ws.end()
+
+    nested: list[Element]
+    section = SECTION_RE.match(text, value, end)
+    if section is not None:
+        nested = [Element(KEY_VALUE, value, section.end())]
+        stop = section.end()
+        ws = WS_RE.match(text, stop, end)
+        if ws is not None and ws.end() < end:
+            nested.append(Element(TEXT, ws.end(), end))
+            stop = end
+    else:
+        if value == end and items:
+            # The innermost item has no value, so it's text within the item before it:
+            value = items.pop()
+        if not items:
+            return None
+        nested = [Element(TEXT, value, end)]
+        stop = end
+
+    elements.extend(Element(LIST_ITEM, item, stop) for item in items)
+    elements.extend(nested)
+    return stop
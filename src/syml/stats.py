@@ -0,0 +1,162 @@
+"""Instrumentation of SYML parsing
+
+Pass a `ParseStats` to `parsers.parse`, `parsers.parse_data` or `syml.loads` to have it filled in, or register an
+observer with `add_observer` to be handed the statistics of every document parsed, e.g. to export them to a metrics
+system. While neither is used, parsing isn't instrumented at all.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .nodes import KeyValue
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .basetypes import StrPath
+    from .nodes import SymlNode
+
+T = TypeVar('T')
+
+observers: list[Callable[[ParseStats], None]] = []
+"""Functions called with the statistics of each document parsed"""
+
+
+@dataclass(slots=True)
+class ParseStats:
+    """Statistics of parsing a document
+
+    `phases` holds the wall time spent in each phase of parsing, in seconds, with the time of any phase nested within
+    another counted only once, in the innermost one. The phases depend on the engine: `match`, `visit` and
+    `incorporate` for the parsimonious grammar, and `scan`, `build` and `incorporate` for the fast scanner, with
+    `as_data` when a tree is converted to data. The fast engine builds data without a tree, scanning included, in a
+    single `build_data` phase. The fast engine's phases are timed as the lines stream through them, so instrumenting it
+    doesn't hold the document in memory between phases. A document read from a `cache.DiskCache` is reported with the
+    `cache` engine, and the time spent reading it in a `cache` phase.
+
+    `nodes` counts the nodes of the tree by class, or the elements of the scanned lines by kind when no tree is built,
+    and `max_depth` is the length of the deepest branch of the tree, counting the root. When strings are shared
+    through a `builders.StringTable`, `shared_strings` counts the copies dropped and `bytes_saved` their size.
+    """
+
+    engine: str = ''
+    filename: StrPath | None = None
+    size: int = 0
+    lines: int = 0
+    max_depth: int = 0
+    shared_strings: int = 0
+    bytes_saved: int = 0
+    nodes: Counter[str] = field(default_factory=Counter)
+    phases: dict[str, float] = field(default_factory=dict)
+    nested: list[float] = field(default_factory=list, repr=False, compare=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of parsing, adding to any time already spent in it."""
+        self.nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self.nested.pop()
+            if self.nested:
+                self.nested[-1] += elapsed
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+
+    def timed(self, items: Iterable[T], name: str) -> Iterator[T]:
+        """Yield each of `items`, counting the time spent producing them in a phase, as `phase` does."""
+        clock = time.perf_counter
+        nested = self.nested
+        iterator = iter(items)
+        total = 0.0
+        try:
+            while True:
+                nested.append(0.0)
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed = clock() - start
+                    total += elapsed - nested.pop()
+                    if nested:
+                        nested[-1] += elapsed
+                yield item
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + total
+
+    def start(self, text: str, filename: StrPath | None, engine: str) -> None:
+        """Record the document about to be parsed."""
+        self.engine = engine
+        self.filename = filename
+        self.size = len(text) if text.isascii() else len(text.encode('utf-8', 'surrogatepass'))
+        self.lines = text.count('\n') + 1 if text else 0
+
+    def count_tree(self, root: SymlNode) -> None:
+        """Count the nodes of a tree, with their keys and comments, and measure its depth."""
+        types: Counter[type[SymlNode]] = Counter()
+        comments = 0
+        depth = 0
+        level: list[SymlNode] = [root]
+        while level:
+            depth += 1
+            types.update(map(type, level))
+            comments += sum(len(node.comments) for node in level if node.comments)
+            level = [child for node in level for child in node.children]
+        counts = self.nodes
+        for node_type, count in types.items():
+            counts[node_type.__name__] += count
+        if types[KeyValue]:
+            counts['KeyLeafNode'] += types[KeyValue]
+        if comments:
+            counts['Comment'] += comments
+        self.max_depth = max(self.max_depth, depth)
+
+    @property
+    def total_time(self) -> float:
+        """Return the total time spent parsing."""
+        return sum(self.phases.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dict of plain values, ready to be exported."""
+        data = asdict(self)
+        del data['nested']
+        data['filename'] = None if self.filename is None else str(self.filename)
+        data['nodes'] = dict(self.nodes)
+        data['total_time'] = self.total_time
+        return data
+
+
+def add_observer(func: Callable[[ParseStats], None]) -> None:
+    """Call `func` with the statistics of every document parsed from now on."""
+    observers.append(func)
+
+
+def remove_observer(func: Callable[[ParseStats], None]) -> None:
+    """Stop calling an observer added with `add_observer`."""
+    observers.remove(func)
+
+
+def phase(stats: ParseStats | None, name: str) -> AbstractContextManager[None]:
+    """Time a phase of parsing if there are statistics to fill in."""
+    return nullcontext() if stats is None else stats.phase(name)
+
+
+def collector(stats: ParseStats | None) -> ParseStats | None:
+    """Return the statistics to fill in for a parse: those given, new ones if anything observes parsing, or None."""
+    if stats is None and observers:
+        return ParseStats()
+    return stats
+
+
+def notify(stats: ParseStats) -> None:
+    """Hand the statistics of a finished parse to each observer."""
+    for func in observers:
+        func(stats)
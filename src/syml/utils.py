@@ -1,17 +1,220 @@
 """Utility functions for SYML"""
 
-from functools import cache
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import sys
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import TYPE_CHECKING, Generic, NamedTuple, TypeVar
+
+if TYPE_CHECKING:  # pragma: nocover
+    from collections.abc import Callable, Iterator, Sequence
+
+    from .basetypes import KeyPath, PathKey, StrPath
+
+T = TypeVar('T')
 
 
-@cache
 def split_lines(text: str, keepends: bool = False) -> list[str]:  # noqa: FBT001, FBT002
-    """Memoized version of str.splitlines()"""
+    """Split `text` into lines, as str.splitlines()"""
     return text.splitlines(keepends=keepends)
 
 
+def iter_mapped_lines(path: StrPath) -> Iterator[str]:
+    """Yield the lines of a UTF-8 file, line endings included, from a memory map of the file.
+
+    Line boundaries are found in the mapped bytes, and each line is decoded on its own, so the file is never read into
+    memory as a whole. A newline byte is always a newline character in UTF-8, so lines can be split before decoding.
+    CRLF and CR line endings are translated to LF, as when reading the file in text mode.
+    """
+    with open(path, 'rb') as fo:  # noqa: PTH123
+        if not os.fstat(fo.fileno()).st_size:
+            return
+        with mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            start = 0
+            while start < size:
+                end = mapped.find(b'\n', start) + 1 or size
+                line = mapped[start:end].decode('utf-8')
+                if '\r' in line:
+                    yield from translate_newlines(line)
+                else:
+                    yield line
+                start = end
+
+
+def translate_newlines(line: str) -> Iterator[str]:
+    """Yield the lines of `line`, with CRLF and CR line endings translated to LF as text mode does."""
+    *lines, rest = line.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    for text in lines:
+        yield text + '\n'
+    if rest:
+        yield rest
+
+
+class CacheInfo(NamedTuple):
+    """Statistics for a PathCache"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    maxbytes: int
+    currbytes: int
+
+
+class PathCache(Generic[T]):
+    """A bounded LRU cache of values derived from path strings, such as the keys and indices `parse_path` splits out
+
+    Entries are evicted, least recently used first, once there are more than `maxsize` of them or once the cached
+    paths and values take up more than `maxbytes` between them, so a long-running process looking up many distinct
+    paths doesn't keep every one of them alive. `sizeof` measures a cached value. The entry most recently added is
+    never evicted, so a path over the byte budget on its own is still cached until the next one comes along.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[str], T],
+        maxsize: int = 128,
+        maxbytes: int = 2**20,
+        sizeof: Callable[[T], int] = sys.getsizeof,
+    ) -> None:
+        self.func = func
+        self.sizeof = sizeof
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = self.misses = self.currbytes = 0
+        self._entries: OrderedDict[str, T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str) -> T:
+        """Return the cached value for `text`, computing it on a miss."""
+        with self._lock:
+            try:
+                value = self._entries[text]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(text)
+                return value
+
+        value = self.func(text)
+        with self._lock:
+            if text not in self._entries:  # pragma: nobranch  # Another thread may have got here first.
+                self._entries[text] = value
+                self.currbytes += sys.getsizeof(text) + self.sizeof(value)
+                self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (len(self._entries) > self.maxsize or self.currbytes > self.maxbytes):
+            text, value = self._entries.popitem(last=False)
+            self.currbytes -= sys.getsizeof(text) + self.sizeof(value)
+
+    def configure(self, maxsize: int | None = None, maxbytes: int | None = None) -> None:
+        """Change the cache's limits, evicting entries as needed to fit within them."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if maxbytes is not None:
+                self.maxbytes = maxbytes
+            self._evict()
+
+    def cache_info(self) -> CacheInfo:
+        """Report cache statistics."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries), self.maxbytes, self.currbytes)
+
+    def cache_clear(self) -> None:
+        """Empty the cache and reset its statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.currbytes = 0
+
+
+@dataclass(slots=True, frozen=True)
+class LineIndex:
+    """The offset at which each line of a document starts, for O(log n) position lookups"""
+
+    starts: tuple[int, ...]
+
+    @classmethod
+    def from_text(cls, text: str) -> LineIndex:
+        """Build an index of the lines in `text`, as split by str.splitlines()."""
+        return cls(tuple(accumulate(map(len, text.splitlines(keepends=True)), initial=0)))
+
+    @property
+    def line_count(self) -> int:
+        """Return the number of lines in the document."""
+        return len(self.starts) - 1
+
+    def locate(self, index: int) -> tuple[int, int]:
+        """Return the (line_number, column) of `index`.
+
+        An index past the end of the document is reported at the start of the last line.
+        """
+        if index >= self.starts[-1]:
+            return max(self.line_count, 1), 0
+        line_number = bisect_right(self.starts, index)
+        return line_number, index - self.starts[line_number - 1]
+
+    def get_line(self, text: str, line_number: int) -> str:
+        """Return the contents of the specified line number of `text`, which this index was built from."""
+        if 0 < line_number <= self.line_count:
+            return text[self.starts[line_number - 1] : self.starts[line_number]]
+        return ''
+
+
 def get_line(text: str, line_number: int) -> str:
     """Return the contents of the specified line number from the given text."""
-    try:
-        return split_lines(text, keepends=True)[line_number - 1]
-    except IndexError:
-        return ''
+    return LineIndex.from_text(text).get_line(text, line_number)
+
+
+PATH_PART_RE = re.compile(r'([^\[\]]*)((?:\[-?\d+\])*)')
+INDEX_RE = re.compile(r'-?\d+')
+
+
+def parse_path(path: str) -> tuple[PathKey, ...]:
+    """Split a path like `services.web.ports[0]` into its keys and list indices.
+
+    Keys are separated by dots, and are followed by any list indices in square brackets. An empty path refers to the
+    whole document.
+    """
+    if not path:
+        return ()
+    keys: list[PathKey] = []
+    for part in path.split('.'):
+        match = PATH_PART_RE.fullmatch(part)
+        if match is None or not part:
+            raise ValueError('Invalid path', path)
+        name, indices = match.groups()
+        if name:
+            keys.append(name)
+        keys.extend(int(index) for index in INDEX_RE.findall(indices))
+    return tuple(keys)
+
+
+def keys_size(keys: tuple[PathKey, ...]) -> int:
+    """Return the memory taken up by the keys and list indices of a path, in bytes."""
+    return sys.getsizeof(keys) + sum(map(sys.getsizeof, keys))
+
+
+parsed_paths: PathCache[tuple[PathKey, ...]] = PathCache(parse_path, maxsize=1024, sizeof=keys_size)
+"""Memoized keys and list indices of path strings, so that repeated lookups don't split them each time"""
+
+
+def path_keys(path: KeyPath) -> Sequence[PathKey]:
+    """Return the keys and list indices of a path, given as a string or as a sequence of them."""
+    return parsed_paths(path) if isinstance(path, str) else path
+
+
+def clear_caches() -> None:
+    """Drop every cached path lookup; parsed documents keep no cached state outside of their own `Document`."""
+    parsed_paths.cache_clear()
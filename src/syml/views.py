@@ -0,0 +1,93 @@
+"""Read-only views of parsed SYML documents, converting values to data only when they are accessed"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, overload
+
+from . import nodes
+
+
+def view(node: nodes.SymlNode | None) -> Any:  # noqa: ANN401
+    """Return a lazy view of a mapping or list node, the text of a text node, or None for no node."""
+    if isinstance(node, nodes.Mapping):
+        return LazyMapping(node)
+    if isinstance(node, nodes.List):
+        return LazyList(node)
+    return None if node is None else node.as_data()
+
+
+def view_entry(entry: nodes.SymlNode) -> Any:  # noqa: ANN401
+    """Return a lazy view of the value of a root, key/value pair or list item."""
+    return view(entry.children[0] if entry.children else None)
+
+
+class LazyMapping(Mapping[str, Any]):
+    """A read-only mapping backed by a parsed mapping node
+
+    Each value is converted when it is first accessed, and kept for later accesses. Lists and mappings within it are
+    themselves lazy views.
+    """
+
+    __slots__ = ('cache', 'node')
+
+    def __init__(self, node: nodes.Mapping) -> None:
+        self.node = node
+        self.cache: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        try:
+            return self.cache[key]
+        except KeyError:
+            value = self.cache[key] = view_entry(self.node.entry(key))
+            return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.node.index())
+
+    def __len__(self) -> int:
+        return len(self.node.index())
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self)!r})'
+
+
+class LazyList(Sequence[Any]):
+    """A read-only sequence backed by a parsed list node
+
+    Each item is converted when it is first accessed, and kept for later accesses. Lists and mappings within it are
+    themselves lazy views. A lazy list compares equal to any other sequence with equal items, except strings.
+    """
+
+    __slots__ = ('cache', 'node')
+
+    def __init__(self, node: nodes.List) -> None:
+        self.node = node
+        self.cache: list[Any] = [...] * len(node.children)
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...  # noqa: ANN401
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.cache)))]
+        item = self.cache[index]
+        if item is ...:
+            item = self.cache[index] = view_entry(self.node.children[index])
+        return item
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self)!r})'
@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import AsyncIterator, Coroutine
+from typing import Any
+
+import pytest
+
+import syml
+from syml import aio, exceptions
+
+DOCUMENT = """\
+name: café
+servers:
+  - host: alpha
+    ports:
+      - 80
+      - 443
+notes: first
+  second
+"""
+
+
+async def chunks(data: str | bytes, size: int) -> AsyncIterator[Any]:
+    for start in range(0, len(data), size):
+        await asyncio.sleep(0)
+        yield data[start : start + size]
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:  # noqa: ANN401
+    return asyncio.run(coro)
+
+
+@pytest.mark.parametrize('engine', ['fast', 'parsimonious'])
+def test_aloads_should_load_as_loads_does(engine: syml.parsers.Engine) -> None:
+    assert run(syml.aloads(DOCUMENT, engine=engine)) == syml.loads(DOCUMENT)
+    assert run(syml.aloads('')) is None
+
+
+@pytest.mark.parametrize('size', [1, 3, 1000])
+@pytest.mark.parametrize('engine', ['fast', 'parsimonious'])
+def test_aload_should_load_a_stream_however_it_is_chunked(engine: syml.parsers.Engine, size: int) -> None:
+    expected = syml.loads(DOCUMENT)
+    assert run(syml.aload(chunks(DOCUMENT, size), engine=engine)) == expected
+    assert run(syml.aload(chunks(DOCUMENT.encode('utf-8'), size), engine=engine)) == expected
+    assert run(syml.aload(chunks(DOCUMENT.rstrip(), size))) == expected
+
+
+def test_aload_should_read_an_asyncio_stream() -> None:
+    async def load() -> Any:  # noqa: ANN401
+        reader = asyncio.StreamReader()
+        reader.feed_data(DOCUMENT.encode('utf-8'))
+        reader.feed_eof()
+        return await syml.aload(reader)
+
+    assert run(load()) == syml.loads(DOCUMENT)
+
+
+@pytest.mark.parametrize('text', ['a: 1\n  - x\n b', 'a: 1\nb:\n- :\n', 'x\u2028y\n  x: 1\n    - q'])
+def test_it_should_raise_the_same_errors_as_loads(text: str) -> None:
+    with pytest.raises(exceptions.ParseError) as expected:
+        syml.loads(text)
+    with pytest.raises(exceptions.ParseError) as error:
+        run(syml.aloads(text))
+    assert error.value.args == expected.value.args
+    with pytest.raises(exceptions.ParseError) as error:
+        run(syml.aload(chunks(text, 2)))
+    assert error.value.args == expected.value.args
+
+
+@pytest.mark.parametrize('load', [syml.aloads, lambda text: syml.aload(chunks(text, len(text)))])
+def test_it_should_let_other_tasks_run_while_parsing(load: Any) -> None:  # noqa: ANN401
+    text = ''.join(f'key{i}: value\n' for i in range(aio.BATCH_LINES * 5))
+
+    async def main() -> int:
+        ticks = 0
+        done = False
+
+        async def tick() -> None:
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        before = ticks
+        assert len(await load(text)) == aio.BATCH_LINES * 5
+        done = True
+        await task
+        return ticks - before
+
+    assert run(main()) >= 5
@@ -2,6 +2,7 @@ import re
 import textwrap
 
 import pytest
+from parsimonious import Grammar
 
 from syml import basetypes
 
@@ -67,6 +68,33 @@ class TestSource:
             text='foo\nbaz',
         )
 
+    def test_it_should_build_from_several_spans(self) -> None:
+        text = 'foo:\n  bar\n  baz\n  qux\n'
+        source = basetypes.Source.from_spans(text, [(7, 10), (13, 16), (19, 22)], filename='foo.txt')
+        assert source == basetypes.Source(
+            filename='foo.txt',
+            start=basetypes.Pos(index=7, line=2, column=2),
+            end=basetypes.Pos(index=22, line=4, column=5),
+            text='bar\nbaz\nqux',
+        )
+        assert source.filename == 'foo.txt'
+        assert source.end == basetypes.Pos(index=22, line=4, column=5)
+
+    def test_building_from_spans_should_match_adding_their_sources(self) -> None:
+        text = 'foo:\n  bar\n  baz\n'
+        spans = [(7, 10), (13, 16)]
+        first, second = (basetypes.Source.from_span(text, start, end) for start, end in spans)
+        added = first + second
+        joined = basetypes.Source.from_spans(text, spans)
+        assert (joined.text, joined.start, joined.end) == (added.text, added.start, added.end)
+
+    def test_it_should_build_from_a_parsimonious_node(self) -> None:
+        pnode = Grammar('doc = ~"\\s*" "foo" ~"\\s*"').parse('\n  foo\n').children[1]
+        source = basetypes.Source.from_node(pnode, filename='foo.txt')
+        assert source.start == basetypes.Pos(index=3, line=2, column=2)
+        assert source.end == basetypes.Pos(index=6, line=2, column=5)
+        assert str(source) == 'foo'
+
     def test_it_should_fail_on_no_substring_match(self) -> None:
         with pytest.raises(ValueError):  # noqa: PT011
             basetypes.Source.from_text('foo', 'bar', filename='blah.txt')
@@ -0,0 +1,123 @@
+import pickle  # noqa: S403
+from pathlib import Path
+
+import pytest
+
+import syml
+from syml import batch
+from syml.basetypes import Pos
+from syml.exceptions import MalformedLineError, OutOfContextNodeError, ParseError
+
+DOCUMENTS = [f'- item {i}\n- name: doc {i}\n' for i in range(20)]
+EXPECTED = [['item ' + str(i), {'name': 'doc ' + str(i)}] for i in range(20)]
+
+
+class TestLoadsMany:
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_it_should_load_documents_in_order(self, workers: int) -> None:
+        assert syml.loads_many(DOCUMENTS, workers=workers) == EXPECTED
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_it_should_return_parse_errors_without_stopping(self, workers: int) -> None:
+        documents = ['foo: bar\n', 'foo:bar\n', '  - foo\n - bar\n', '- baz\n']
+        filenames = ['a.syml', 'b.syml', 'c.syml', 'd.syml']
+        good, malformed, out_of_context, also_good = syml.loads_many(documents, filenames, workers=workers)
+        assert good == {'foo': 'bar'}
+        assert also_good == ['baz']
+        assert isinstance(malformed, MalformedLineError)
+        assert malformed.filename == 'b.syml'
+        assert malformed.args[1] == Pos(index=0, line=1, column=0)
+        assert isinstance(out_of_context, OutOfContextNodeError)
+        assert out_of_context.filename == 'c.syml'
+
+    def test_it_should_load_nothing(self) -> None:
+        assert syml.loads_many([]) == []
+
+    def test_errors_should_not_need_a_filename(self) -> None:
+        [error] = syml.loads_many(['foo:bar'])
+        assert isinstance(error, ParseError)
+        assert error.filename is None
+
+    def test_it_should_need_a_filename_for_each_document(self) -> None:
+        with pytest.raises(ValueError, match='zip'):
+            syml.loads_many(['foo', 'bar'], ['a.syml'])
+
+    def test_errors_should_keep_their_filename_when_pickled(self) -> None:
+        [error] = syml.loads_many(['foo:bar'], ['a.syml'])
+        copy = pickle.loads(pickle.dumps(error))  # noqa: S301
+        assert copy.filename == 'a.syml'
+        assert copy.args == error.args
+
+
+class TestLoadMany:
+    @pytest.mark.parametrize('workers', [None, 1, 2])
+    def test_it_should_load_files_in_order(self, tmp_path: Path, workers: int | None) -> None:
+        paths = []
+        for i, document in enumerate(DOCUMENTS):
+            path = tmp_path / f'{i}.syml'
+            path.write_text(document, encoding='utf-8')
+            paths.append(path)
+        assert syml.load_many(paths, workers=workers) == EXPECTED
+
+    def test_it_should_report_the_path_of_a_bad_file(self, tmp_path: Path) -> None:
+        good, bad = tmp_path / 'good.syml', tmp_path / 'bad.syml'
+        good.write_text('foo: bar\n', encoding='utf-8')
+        bad.write_text('foo: bar\nbaz:qux\n', encoding='utf-8')
+        result, error = syml.load_many([good, bad], workers=2)
+        assert result == {'foo': 'bar'}
+        assert isinstance(error, MalformedLineError)
+        assert error.filename == bad
+        assert error.args[1].line == 2
+
+
+class TestLoadsSplit:
+    @pytest.fixture(autouse=True)
+    def small_parts(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(batch, 'MIN_PART_SIZE', 20)
+
+    @pytest.mark.parametrize(
+        'document',
+        [
+            ''.join(f'# entry {i}\nkey{i}:\n  - item\n  - name: {i}\n    text\n' for i in range(20)) + 'key3: again\n',
+            '# comments only\n' * 10 + ''.join(f'- item {i}\n  - nested\n- k: {i}\n' for i in range(20)),
+        ],
+        ids=['mapping', 'list'],
+    )
+    def test_it_should_load_the_same_data_as_loads(self, document: str) -> None:
+        expected = syml.loads(document)
+        result = syml.loads_split(document, workers=2)
+        assert result == expected
+        assert list(result) == list(expected)
+
+    def test_it_should_split_before_top_level_entries(self) -> None:
+        document = 'a: 1\n  more\nb:\n  c: 2\nd: 3\ne: 4\n'
+        assert batch.split_points(document, 'key_value', 3) == [0, 12, 22]
+        assert batch.split_points(document, 'list_item', 3) == [0]
+        assert batch.split_points('a: 1\nb:c\nd: 2\n', 'key_value', 4) == [0, 9]
+
+    def test_parts_should_tell_if_the_next_part_starts_a_top_level_entry(self) -> None:
+        assert batch.load_part('a: 1\nb:\n  - c\n', 'key_value') == ({'a': '1', 'b': ['c']}, True)
+        assert batch.load_part('- - a\n', 'list_item') == ([['a']], False)
+        assert batch.load_part('- a\n', 'key_value') == (['a'], False)
+        assert batch.load_part('# only a comment\n', 'key_value') == (None, True)
+        assert batch.load_part('- a\n', None) == (['a'], True)
+        assert isinstance(batch.load_part('a:b\n', None), ParseError)
+
+    @pytest.mark.parametrize('document', ['- - a\n- b\n' * 10, '- k: v\nk2: w\n' * 10])
+    def test_it_should_load_the_whole_document_if_a_part_continues_an_entry(self, document: str) -> None:
+        assert syml.loads_split(document, workers=2) == syml.loads(document)
+
+    @pytest.mark.parametrize('document', ['text\n' * 20, '  a: 1\n' * 20, '# nothing\n' * 20, 'a: 1\n', '- a\n' * 20])
+    def test_it_should_load_other_documents_as_loads_does(self, document: str) -> None:
+        assert syml.loads_split(document) == syml.loads(document)
+        assert syml.loads_split(document, workers=3) == syml.loads(document)
+
+    @pytest.mark.parametrize('bad_line', ['a:b', '  - x'])
+    def test_it_should_report_errors_in_the_whole_document(self, bad_line: str) -> None:
+        document = ''.join(f'key{i}: value\n' for i in range(20)) + bad_line + '\n' + 'after: more\n' * 5
+        with pytest.raises(ParseError) as expected:
+            syml.loads(document)
+        with pytest.raises(ParseError) as error:
+            syml.loads_split(document, workers=2)
+        assert type(error.value) is type(expected.value)
+        assert error.value.args == expected.value.args
@@ -0,0 +1,66 @@
+import json
+from typing import Any
+
+import pytest
+
+from syml import bench, loads, parsers
+
+
+@pytest.mark.parametrize('corpus', list(bench.CORPORA))
+def test_each_corpus_should_parse_the_same_with_either_engine(corpus: str) -> None:
+    text = bench.CORPORA[corpus](20)
+    assert text
+    assert loads(text) == parsers.parse(text, engine='parsimonious').as_data()
+
+
+def test_deep_nesting_should_nest_one_list_and_mapping_per_level() -> None:
+    data = loads(bench.deep_nesting(3))
+    assert data == {'branch0': [{'level0': [{'level1': [{'level2': 'leaf'}]}]}]}
+
+
+def test_deep_list_should_not_cap_the_depth() -> None:
+    data: Any = loads(bench.deep_list(5000))
+    depth = 0
+    while isinstance(data, list):
+        [data] = data
+        depth += 1
+    assert (depth, data) == (5000, 'leaf')
+
+
+def test_it_should_skip_json_dumps_on_the_deep_list() -> None:
+    results = bench.run(corpora=['deep_list'], scale=5000, repeat=1)
+    assert [r.operation for r in results] == [operation for operation in bench.OPERATIONS if operation != 'json.dumps']
+
+
+def test_it_should_measure_each_operation_on_each_corpus() -> None:
+    results = bench.run(corpora=['long_list', 'tab_indented'], scale=10, repeat=1)
+    assert [(r.corpus, r.operation) for r in results] == [
+        (corpus, operation) for corpus in ['long_list', 'tab_indented'] for operation in bench.OPERATIONS
+    ]
+    for result in results:
+        assert result.size == len(bench.CORPORA[result.corpus](10).encode())
+        assert result.seconds > 0
+        assert result.peak_memory > 0
+        assert result.throughput == result.size / result.seconds / 1e6
+
+
+def test_throughput_should_be_infinite_for_an_unmeasurably_fast_run() -> None:
+    assert bench.Result('long_list', 'loads', 10, 0.0, 0).throughput == float('inf')
+
+
+def test_it_should_report_a_table(capsys: pytest.CaptureFixture[str]) -> None:
+    assert bench.main(['--corpus', 'wide_mapping', '--operation', 'loads', '--scale', '10', '--repeat', '1']) == 0
+    header, row = capsys.readouterr().out.splitlines()
+    assert header.split()[:2] == ['corpus', 'operation']
+    assert row.split()[:2] == ['wide_mapping', 'loads']
+
+
+def test_it_should_report_json(capsys: pytest.CaptureFixture[str]) -> None:
+    assert (
+        bench.main(['--corpus', 'long_text', '--operation', 'as_source', '--scale', '10', '--repeat', '1', '--json'])
+        == 0
+    )
+    [result] = json.loads(capsys.readouterr().out)
+    assert result['corpus'] == 'long_text'
+    assert result['operation'] == 'as_source'
+    assert set(result) == {'corpus', 'operation', 'size', 'seconds', 'peak_memory', 'throughput'}
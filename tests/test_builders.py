@@ -0,0 +1,215 @@
+import io
+import sys
+import textwrap
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import syml
+from syml import builders, exceptions, parsers
+from syml.basetypes import Pos
+
+
+class TestBuildData:
+    @pytest.mark.parametrize(
+        'text',
+        [
+            '',
+            'true',
+            '- foo\n- bar\n  baz\n',
+            'foo:\n  - bar\n  - baz: boo\n    blah:\n      baloon\nbooleans?: true\n',
+            '- - nested\n  - list\n- foo:\n- bar: baz\n  bar: boo\n',
+            'foo: bar\nfoo: baz\nblah: boo\nfoo:\n',
+            '  - indented\n  - root\n',
+            '- foo\n    bar\n  baz\nboo\n',
+        ],
+    )
+    def test_it_should_build_the_same_data_as_the_node_tree(self, text: str) -> None:
+        assert builders.build_data(text) == parsers.parse(text).as_data()
+
+    def test_it_should_skip_comments(self) -> None:
+        text = textwrap.dedent(
+            """
+            # A comment
+            - foo:
+
+              - bar
+              // Something else entirely
+              - baz
+
+            - blah: boo # not a comment!
+            """
+        )
+        assert builders.build_data(text) == [{'foo': ['bar', 'baz']}, {'blah': 'boo # not a comment!'}]
+
+    def test_it_fails_building_weird_indentations(self) -> None:
+        text = '  - foo:\n      - bar\n - baz\n- blah\n'
+        with pytest.raises(exceptions.OutOfContextNodeError) as exc_info:
+            builders.build_data(text)
+        with pytest.raises(exceptions.OutOfContextNodeError) as tree_exc_info:
+            parsers.parse(text)
+        assert exc_info.value.args == tree_exc_info.value.args
+
+    def test_it_fails_building_malformed_lines(self) -> None:
+        with pytest.raises(exceptions.MalformedLineError):
+            builders.build_data('foo:bar')
+
+
+NOTES = 'x' * 80
+
+
+def manifest() -> str:
+    """Return a list of four similar mappings, with keys never interned before."""
+    tag = uuid.uuid4().hex
+    return ''.join(f'- name{tag}: app-{i % 2}\n  port{tag}: 80\n  notes{tag}: {NOTES}\n' for i in range(4))
+
+
+class TestStringTable:
+    def test_it_should_intern_keys(self) -> None:
+        table = builders.StringTable()
+        keys = [key for item in builders.build_data(manifest(), strings=table) for key in item]
+        assert all(key is keys[0] for key in keys[::3])
+        assert table.shared == 9
+        assert table.saved == 3 * sum(map(sys.getsizeof, keys[:3]))
+
+    def test_it_should_share_short_repeated_values(self) -> None:
+        text = manifest()
+        table = builders.StringTable(keys=False, values=True)
+        data = builders.build_data(text, strings=table)
+        assert data == builders.build_data(text)
+        name, port, notes = data[0]
+        assert data[0][name] is data[2][name]
+        assert data[0][port] is data[1][port]
+        assert data[0][notes] is not data[1][notes]
+        assert table.shared == 5
+
+    def test_it_should_report_the_memory_saved(self) -> None:
+        text = manifest()
+        stats = syml.ParseStats()
+        data: Any = syml.loads(text, stats=stats, intern_keys=True, dedupe_values=True)
+        assert data == syml.loads(text)
+        assert stats.shared_strings == 14
+        keys = sum(map(sys.getsizeof, data[0]))
+        assert stats.bytes_saved == 3 * keys + 3 * sys.getsizeof('80') + 2 * sys.getsizeof('app-0')
+        assert syml.load(io.StringIO(text), intern_keys=True) == data
+
+    def test_it_should_share_strings_in_cached_data(self, tmp_path: Path) -> None:
+        text = manifest()
+        cache = syml.DiskCache(tmp_path)
+        syml.loads(text, cache=cache, dedupe_values=True)
+        data: Any = syml.loads(text, cache=cache, dedupe_values=True)
+        port = list(data[0])[1]
+        assert data[0][port] is data[1][port]
+
+    def test_it_should_need_the_fast_engine(self) -> None:
+        with pytest.raises(ValueError, match='fast engine'):
+            syml.loads(manifest(), engine='parsimonious', intern_keys=True)
+        with pytest.raises(ValueError, match='cannot share strings'):
+            syml.loads(manifest(), lazy=True, intern_keys=True)
+
+
+class TestIterData:
+    @pytest.mark.parametrize(
+        ('text', 'expected'),
+        [
+            ('', []),
+            ('foo\n  bar\n', ['foo\nbar']),
+            (
+                '- foo\n- bar:\n    - baz\n  # comment\n  blah: boo\n- - x\n',
+                ['foo', {'bar': ['baz'], 'blah': 'boo'}, ['x']],
+            ),
+            ('foo: bar\nfoo: baz\nblah:\n  - boo\n', [('foo', 'bar'), ('foo', 'baz'), ('blah', ['boo'])]),
+            ('  - indented\n  - root\n', ['indented', 'root']),
+        ],
+    )
+    def test_it_should_yield_each_top_level_entry(self, text: str, expected: list[Any]) -> None:
+        assert list(builders.iter_data(io.StringIO(text))) == expected
+
+    def test_it_should_yield_entries_as_soon_as_they_are_complete(self) -> None:
+        lines = iter(['- foo\n', '  bar\n', '- baz\n', '- blah\n'])
+        entries = builders.iter_data(lines)
+        assert next(entries) == 'foo\nbar'
+        assert next(lines) == '- blah\n'
+        assert next(entries) == 'baz'
+        assert list(entries) == []
+
+    def test_it_should_report_errors_at_their_position_in_the_document(self) -> None:
+        text = '  - foo:\n      - bar\n - baz\n- blah\n'
+        with pytest.raises(exceptions.OutOfContextNodeError) as exc_info:
+            list(builders.iter_data(io.StringIO(text)))
+        with pytest.raises(exceptions.OutOfContextNodeError) as tree_exc_info:
+            parsers.parse(text)
+        assert exc_info.value.args == tree_exc_info.value.args
+
+    def test_it_should_number_lines_as_loads_does(self) -> None:
+        text = 'x\u2028y\rz\n  x: 1\n    - q'
+        with pytest.raises(exceptions.OutOfContextNodeError) as exc_info:
+            list(builders.iter_data(io.StringIO(text, newline='')))
+        with pytest.raises(exceptions.OutOfContextNodeError) as expected:
+            syml.loads(text)
+        assert exc_info.value.args == expected.value.args
+        assert exc_info.value.args[1].line == 4
+
+    def test_it_should_report_malformed_lines_at_their_position_in_the_document(self) -> None:
+        with pytest.raises(exceptions.MalformedLineError) as exc_info:
+            list(builders.iter_data(io.StringIO('foo: bar\n  baz:qux\n')))
+        assert exc_info.value.args == ('Failed to parse a line', Pos(11, 2, 2), '  baz:qux\n')
+
+
+def rebuild_data(events: Iterable[builders.Event]) -> Any:  # noqa: ANN401
+    stack: list[Any] = [[]]
+    keys: list[str] = []
+    for event in events:
+        if event.type in {builders.START_MAPPING, builders.START_LIST}:
+            stack.append({} if event.type == builders.START_MAPPING else [])
+            continue
+        if event.type == builders.KEY:
+            keys.append(event.value)  # type: ignore[arg-type]
+            continue
+        if event.type == builders.COMMENT:
+            continue
+        value = stack.pop() if event.type in {builders.END_MAPPING, builders.END_LIST} else event.value
+        if isinstance(stack[-1], dict):
+            stack[-1][keys.pop()] = value
+        else:
+            stack[-1].append(value)
+    return stack[0][0] if stack[0] else None
+
+
+class TestIterEvents:
+    def test_it_should_report_the_structure_of_a_document(self) -> None:
+        text = '# top\n- foo: bar\n  baz:\n- - x\n  # c\n    y\n'
+        assert list(builders.iter_events(text)) == [
+            builders.Event(builders.COMMENT, ' top', 1, 5),
+            builders.Event(builders.START_LIST, None, 6, 6),
+            builders.Event(builders.START_MAPPING, None, 8, 8),
+            builders.Event(builders.KEY, 'foo', 8, 11),
+            builders.Event(builders.SCALAR, 'bar', 13, 16),
+            builders.Event(builders.KEY, 'baz', 19, 22),
+            builders.Event(builders.SCALAR, None, 23, 23),
+            builders.Event(builders.END_MAPPING, None, 23, 23),
+            builders.Event(builders.START_LIST, None, 26, 26),
+            builders.Event(builders.COMMENT, ' c', 33, 35),
+            builders.Event(builders.SCALAR, 'x\ny', 28, 41),
+            builders.Event(builders.END_LIST, None, 41, 41),
+            builders.Event(builders.END_LIST, None, 41, 41),
+        ]
+
+    @pytest.mark.parametrize(
+        'text',
+        [
+            '',
+            'true\n  false',
+            'foo:\n  - bar\n  - baz: boo\n    blah:\n      baloon\nbooleans?: true\n',
+            '- - nested\n  - list\n- foo:\n- bar: baz\n  bar: boo\n',
+        ],
+    )
+    def test_it_should_report_events_matching_the_data(self, text: str) -> None:
+        assert rebuild_data(builders.iter_events(text)) == builders.build_data(text)
+
+    def test_it_fails_on_weird_indentations(self) -> None:
+        with pytest.raises(exceptions.OutOfContextNodeError):
+            list(builders.iter_events('  - foo:\n      - bar\n - baz\n- blah\n'))
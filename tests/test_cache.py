@@ -0,0 +1,145 @@
+import marshal
+import os
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import syml
+from syml import cache
+from syml.exceptions import MalformedLineError
+
+
+class Loader:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def __call__(self, document: str) -> Any:  # noqa: ANN401
+        self.calls.append(document)
+        return syml.loads(document)
+
+
+class TestDiskCache:
+    def test_it_should_load_a_document_once(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path / 'cache')
+        loader = Loader()
+        assert disk_cache.load('foo: bar\n', loader) == {'foo': 'bar'}
+        assert disk_cache.load('foo: bar\n', loader) == {'foo': 'bar'}
+        assert loader.calls == ['foo: bar\n']
+
+    def test_it_should_persist_between_instances(self, tmp_path: Path) -> None:
+        cache.DiskCache(tmp_path).load('- foo\n', Loader())
+        loader = Loader()
+        assert cache.DiskCache(tmp_path).load('- foo\n', loader) == ['foo']
+        assert loader.calls == []
+
+    def test_it_should_cache_an_empty_document(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path)
+        loader = Loader()
+        assert disk_cache.load('', loader) is None
+        assert disk_cache.load('', loader) is None
+        assert loader.calls == ['']
+
+    def test_it_should_key_entries_by_library_version(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        old_key = cache.DiskCache(tmp_path).key('foo')
+        monkeypatch.setattr(metadata, 'version', lambda _name: '99.0')
+        assert cache.library_version() == '99.0'
+        assert cache.DiskCache(tmp_path).key('foo') != old_key
+
+    def test_it_should_load_again_over_a_corrupt_entry(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path)
+        disk_cache.load('foo', Loader())
+        disk_cache.path('foo').write_bytes(b'\xff\x00')
+        loader = Loader()
+        assert disk_cache.load('foo', loader) == 'foo'
+        assert loader.calls == ['foo']
+
+    def test_it_should_not_cache_parse_errors(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path)
+        with pytest.raises(MalformedLineError):
+            disk_cache.load('foo:bar', Loader())
+        assert disk_cache.entries() == []
+
+    def test_it_should_evict_the_least_recently_used_entries(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path)
+        documents = [f'- item {i}\n' for i in range(3)]
+        for i, document in enumerate(documents):
+            disk_cache.load(document, Loader())
+            os.utime(disk_cache.path(document), (i, i))
+        entry_size = disk_cache.total_size() // 3
+        disk_cache.max_bytes = entry_size * 3
+
+        disk_cache.load(documents[0], Loader())  # bumps the first entry
+        disk_cache.load('- item 3\n', Loader())
+        assert not disk_cache.path(documents[1]).exists()
+        assert disk_cache.path(documents[0]).exists()
+        assert disk_cache.path(documents[2]).exists()
+        assert disk_cache.total_size() == disk_cache.size == entry_size * 3
+
+    def test_it_should_keep_nothing_without_room(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path, max_bytes=0)
+        assert disk_cache.load('foo', Loader()) == 'foo'
+        assert disk_cache.entries() == []
+        assert disk_cache.size == 0
+
+    def test_it_should_not_count_an_overwritten_entry_twice(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path)
+        disk_cache.load('foo', Loader())
+        disk_cache.store(disk_cache.path('foo'), marshal.dumps('foo'))
+        assert disk_cache.size == disk_cache.total_size()
+
+    def test_it_should_hit_an_entry_evicted_as_it_is_read(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        disk_cache = cache.DiskCache(tmp_path)
+        disk_cache.load('foo', Loader())
+
+        def evicted(path: Path) -> None:
+            path.unlink()
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr(os, 'utime', evicted)
+        loader = Loader()
+        assert disk_cache.load('foo', loader) == 'foo'
+        assert loader.calls == []
+
+    def test_it_should_clear_its_entries(self, tmp_path: Path) -> None:
+        disk_cache = cache.DiskCache(tmp_path)
+        disk_cache.load('foo', Loader())
+        disk_cache.clear()
+        assert disk_cache.entries() == []
+        assert disk_cache.size == 0
+
+
+class TestLoadsWithCache:
+    def test_it_should_load_from_the_cache(self, tmp_path: Path) -> None:
+        disk_cache = syml.DiskCache(tmp_path)
+        text = 'foo:\n  - bar\n  - baz\n'
+        assert syml.loads(text, cache=disk_cache) == {'foo': ['bar', 'baz']}
+        assert len(disk_cache.entries()) == 1
+        disk_cache.path(text).write_bytes(marshal.dumps('from the cache'))
+        assert syml.loads(text, cache=disk_cache) == 'from the cache'
+
+    def test_load_should_use_the_cache(self, tmp_path: Path) -> None:
+        disk_cache = syml.DiskCache(tmp_path)
+        path = tmp_path / 'doc.syml'
+        path.write_text('foo: bar\n', encoding='utf-8')
+        with path.open() as fi:
+            assert syml.load(fi, cache=disk_cache) == {'foo': 'bar'}
+        assert len(disk_cache.entries()) == 1
+
+    def test_it_should_report_cache_hits(self, tmp_path: Path) -> None:
+        disk_cache = syml.DiskCache(tmp_path)
+        seen: list[syml.ParseStats] = []
+        syml.add_observer(seen.append)
+        try:
+            syml.loads('- foo\n', cache=disk_cache)
+            syml.loads('- foo\n', filename='doc.syml', cache=disk_cache)
+        finally:
+            syml.remove_observer(seen.append)
+        assert [result.engine for result in seen] == ['fast', 'cache']
+        assert (seen[1].filename, seen[1].size, seen[1].lines) == ('doc.syml', 6, 2)
+        result = syml.ParseStats()
+        syml.loads('- foo\n', cache=disk_cache, stats=result)
+        assert (result.engine, list(result.phases)) == ('cache', ['cache'])
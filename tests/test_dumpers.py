@@ -0,0 +1,130 @@
+import io
+import textwrap
+from typing import Any
+
+import pytest
+
+import syml
+from syml import dumpers
+from syml.exceptions import DumpError
+
+
+def test_it_should_write_nested_data() -> None:
+    data = {
+        'name': 'example',
+        'tags': ['a', 'b'],
+        'records': [{'id': '1', 'items': ['x']}, {'id': '2', 'empty': None}],
+        'notes': 'first line\nsecond line',
+        'empty': None,
+    }
+    assert syml.dumps(data) == textwrap.dedent(
+        """\
+        name: example
+        tags:
+          - a
+          - b
+        records:
+          - id: 1
+            items:
+              - x
+          - id: 2
+            empty:
+        notes: first line
+          second line
+        empty:
+        """
+    )
+    assert syml.loads(syml.dumps(data)) == data
+
+
+def test_it_should_write_top_level_text() -> None:
+    assert syml.dumps('foo\nbar') == 'foo\nbar\n'
+
+
+def test_it_should_write_nothing_for_none() -> None:
+    assert syml.dumps(None) == ''
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        [['a', 'b']],
+        [{'k': 'v'}, ['a', ['b']]],
+        ['a', ['b'], 'c'],
+        [[{'foo': None}, {'bar': 'baz'}]],
+        [[{'foo': None, 'bar': None}, 'x']],
+        [[[{'a': None, 'b': {'c': None}}, 'd']]],
+        {'k': [{'a': None}], 'j': 'x'},
+        ['a b: c', '#d', 'e\nf g'],
+        ['a b: c', '#d', 'e\n-f g'],
+        {'key': 'value: with colon', '-k': 'x', 'a#b': 'y', 'é': '//', 'dash': '-x'},
+        ('a', 'b'),
+    ],
+)
+def test_it_should_round_trip(data: Any) -> None:  # noqa: ANN401
+    expected = list(data) if isinstance(data, tuple) else data
+    assert syml.loads(syml.dumps(data)) == expected
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        {},
+        [],
+        '',
+        [None],
+        ['a\n\nb'],
+        ['a\n  b'],
+        ['a\n- b'],
+        ['a\nb: c'],
+        ['a\n# b'],
+        [' a'],
+        {'a b': 'c'},
+        {'a:b': 'c'},
+        {'#a': 'c'},
+        {'': 'c'},
+        [['a'], 'b'],
+        ['a', {'b': None}, ['c'], 'd'],
+    ],
+)
+def test_it_should_reject_data_it_cannot_represent(data: Any) -> None:  # noqa: ANN401
+    with pytest.raises(DumpError):
+        syml.dumps(data)
+
+
+@pytest.mark.parametrize('data', [1, {'a': 1.5}, {1: 'a'}])
+def test_it_should_reject_other_types(data: Any) -> None:  # noqa: ANN401
+    with pytest.raises(TypeError):
+        syml.dumps(data)
+
+
+def test_it_should_write_deep_nesting_without_recursion() -> None:
+    data: Any = 'leaf'
+    for i in range(2000):
+        data = {f'level{i}': data}
+    lines = syml.dumps(data).splitlines()
+    assert len(lines) == 2000
+    assert lines[0] == 'level1999:'
+    assert lines[-1] == ' ' * 3998 + 'level0: leaf'
+
+
+class TestDump:
+    def test_it_should_write_in_chunks(self) -> None:
+        data = [f'item {i}' for i in range(100)]
+        writes: list[str] = []
+        file_obj = io.StringIO()
+        file_obj.write = writes.append  # type: ignore[method-assign, assignment]
+        dumpers.dump(data, file_obj, chunk_size=100)
+        assert len(writes) > 1
+        assert all(len(chunk) < 120 for chunk in writes)
+        assert ''.join(writes) == syml.dumps(data)
+
+    def test_it_should_write_to_a_file(self) -> None:
+        file_obj = io.StringIO()
+        syml.dump({'a': ['b']}, file_obj)
+        assert file_obj.getvalue() == 'a:\n  - b\n'
+
+    def test_it_should_write_nothing_for_none(self) -> None:
+        file_obj = io.StringIO()
+        syml.dump(None, file_obj)
+        assert file_obj.getvalue() == ''
@@ -0,0 +1,162 @@
+import textwrap
+
+import pytest
+
+from syml import nodes, parsers
+from syml.exceptions import DumpError
+
+DOCUMENT = textwrap.dedent(
+    """\
+    # Settings
+    name: example  # not a comment
+    servers:
+      - host: alpha
+        ports:
+          - 80
+          - 443
+      # the backup
+      - host: beta
+    tags:
+    \t- one
+    \t- two
+    """
+)
+
+
+@pytest.fixture
+def root() -> nodes.Root:
+    return parsers.parse(DOCUMENT)
+
+
+def assert_consistent(root: nodes.Root) -> None:
+    assert root.as_data() == parsers.parse(root.document.text).as_data()
+
+
+class TestSet:
+    def test_it_should_rewrite_only_the_entry(self, root: nodes.Root) -> None:
+        root.set('servers[0].ports[1]', '8443')
+        assert root.document.text == DOCUMENT.replace('443', '8443')
+        assert_consistent(root)
+
+    def test_it_should_write_nested_values(self, root: nodes.Root) -> None:
+        root.set(['name'], {'first': 'a', 'last': ['b', 'c']})
+        assert root.document.text == DOCUMENT.replace(
+            'name: example  # not a comment\n', 'name:\n  first: a\n  last:\n    - b\n    - c\n'
+        )
+        assert_consistent(root)
+
+    def test_it_should_write_items_following_a_tab(self, root: nodes.Root) -> None:
+        root.set(['tags', 0], {'label': 'one', 'more': 'x'})
+        assert root.document.text == DOCUMENT.replace('\t- one\n', '\t- label: one\n      more: x\n')
+        assert_consistent(root)
+
+    def test_it_should_add_missing_keys_to_the_end_of_the_mapping(self, root: nodes.Root) -> None:
+        root.set(['servers', 1, 'port'], '22')
+        root.set(['servers', 0, 'tls'], None)
+        assert root.document.text == DOCUMENT.replace('host: beta\n', 'host: beta\n    port: 22\n').replace(
+            '      - 443\n', '      - 443\n    tls:\n'
+        )
+        assert_consistent(root)
+
+    def test_it_should_line_up_keys_after_an_empty_one_with_the_dash(self) -> None:
+        root = parsers.parse('- - first:\n- second\n')
+        root.set([0, 0, 'third'], 'x')
+        assert root.document.text == '- - first:\nthird: x\n- second\n'
+        assert root.as_data() == [[{'first': None, 'third': 'x'}, 'second']]
+
+    def test_it_should_refuse_values_that_would_take_other_entries(self) -> None:
+        text = '- - a\n  - b\n'
+        root = parsers.parse(text)
+        with pytest.raises(DumpError):
+            root.set([0, 0], {'key': None})
+        assert root.document.text == text
+        assert root.as_data() == [['a', 'b']]
+
+    def test_it_should_refuse_values_that_cannot_be_written(self, root: nodes.Root) -> None:
+        with pytest.raises(DumpError):
+            root.set(['tags', 0], None)
+        assert root.document.text == DOCUMENT
+
+    def test_it_should_refuse_an_empty_path(self, root: nodes.Root) -> None:
+        with pytest.raises(ValueError, match='whole document'):
+            root.set([], 'x')
+
+
+class TestInsert:
+    def test_it_should_insert_before_an_item(self, root: nodes.Root) -> None:
+        root.insert(['servers', 0, 'ports', 0], '8080')
+        root.insert(['tags', -1], 'one and a half')
+        assert root.document.text == DOCUMENT.replace('      - 80\n', '      - 8080\n      - 80\n').replace(
+            '\t- two\n', '\t- one and a half\n\t- two\n'
+        )
+        assert_consistent(root)
+
+    def test_it_should_append_after_the_last_item(self, root: nodes.Root) -> None:
+        root.insert(['servers', 99], {'host': 'gamma'})
+        assert root.as_data()['servers'][-1] == {'host': 'gamma'}
+        assert root.document.text == DOCUMENT.replace('host: beta\n', 'host: beta\n  - host: gamma\n')
+
+    def test_it_should_insert_before_an_item_sharing_a_dash(self) -> None:
+        root = parsers.parse('- - a\n')
+        root.insert([0, 0], 'b')
+        root.insert([0, 2], 'c')
+        assert root.document.text == '- - b\n  - a\n  - c\n'
+        assert root.as_data() == [['b', 'a', 'c']]
+
+    def test_it_should_refuse_items_that_would_leave_other_entries_out_of_place(self) -> None:
+        text = '- - a: 1\nb: 2\n'
+        root = parsers.parse(text)
+        with pytest.raises(DumpError):
+            root.insert([0, 0], 'z')
+        assert root.document.text == text
+        assert root.as_data() == [[{'a': '1', 'b': '2'}]]
+
+    def test_it_should_only_insert_into_lists(self, root: nodes.Root) -> None:
+        with pytest.raises(TypeError):
+            root.insert(['servers', 0, 'host'], 'x')
+        with pytest.raises(TypeError):
+            root.insert(['name', 0], 'x')
+        with pytest.raises(TypeError):
+            root.insert([], 'x')
+
+
+class TestDelete:
+    def test_it_should_remove_the_lines_of_the_entry(self, root: nodes.Root) -> None:
+        root.delete(['servers', 0, 'ports'])
+        root.delete(['tags', 0])
+        assert root.document.text == DOCUMENT.replace('    ports:\n      - 80\n      - 443\n', '').replace(
+            '\t- one\n', ''
+        )
+        assert_consistent(root)
+
+    def test_it_should_move_the_next_entry_onto_a_shared_line(self, root: nodes.Root) -> None:
+        root.delete(['servers', 0, 'host'])
+        assert root.document.text == DOCUMENT.replace('host: alpha\n    ', '')
+        assert root.as_data()['servers'][0] == {'ports': ['80', '443']}
+
+    def test_it_should_remove_the_last_line(self) -> None:
+        root = parsers.parse('a: 1\nb: 2')
+        root.delete(['b'])
+        assert root.document.text == 'a: 1\n'
+
+    def test_it_should_refuse_to_leave_an_empty_container(self, root: nodes.Root) -> None:
+        with pytest.raises(DumpError):
+            root.delete(['servers', 1, 'host'])
+        with pytest.raises(ValueError, match='whole document'):
+            root.delete([])
+
+    @pytest.mark.parametrize(
+        ('text', 'path'),
+        [
+            ('- a:\n- x\n  - y\n', [1]),
+            ('- k:\n      - q\n    b:\n    - q\n', [0, 'k']),
+            ('- - b\n    - k:\n    a: x\n', [0, 0]),
+        ],
+    )
+    def test_it_should_refuse_deletions_that_would_move_other_entries(self, text: str, path: list[str | int]) -> None:
+        root = parsers.parse(text)
+        data = root.as_data()
+        with pytest.raises(DumpError):
+            root.delete(path)
+        assert root.document.text == text
+        assert root.as_data() == data
@@ -0,0 +1,83 @@
+import os
+import subprocess  # noqa: S404
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from parsimonious import Grammar
+
+import syml
+from syml import grammar, parsers
+
+SLOW_IMPORTS = ['parsimonious', 'regex', 'syml.grammar', 'asyncio', 'concurrent.futures', 'importlib.metadata']
+IMPORT_BUDGET = 0.5
+
+
+def import_times(statement: str) -> dict[str, float]:
+    """Run `statement` in a new interpreter under `-X importtime`, returning the cumulative seconds of each import."""
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join([str(Path(syml.__file__).parents[1]), os.environ.get('PYTHONPATH', '')]),
+    }
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', statement], capture_output=True, text=True, env=env, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.rsplit('|', 2) if line.startswith('import time:') else ('', '', '')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_importing_syml_should_not_import_the_grammar_or_other_slow_dependencies() -> None:
+    times = import_times('import syml')
+    assert [name for name in SLOW_IMPORTS if name in times] == []
+    assert times['syml'] < IMPORT_BUDGET
+
+
+def test_the_grammar_should_be_imported_on_first_use() -> None:
+    times = import_times("import syml; syml.loads('a: b', engine='parsimonious')")
+    assert 'parsimonious' in times
+    assert 'syml.grammar' in times
+
+
+def test_the_grammar_should_be_compiled_on_the_first_parse(monkeypatch: pytest.MonkeyPatch) -> None:
+    compiled: list[str] = []
+
+    def compile_grammar(rules: str) -> Grammar:
+        compiled.append(rules)
+        return Grammar(rules)
+
+    monkeypatch.setattr(grammar, '_grammar', None)
+    monkeypatch.setattr(grammar, 'Grammar', compile_grammar)
+    parser = parsers.SymlParser()
+    assert compiled == []
+    parser.parse('a: b')
+    parsers.parse('c: d', engine='parsimonious')
+    assert compiled == [grammar.GRAMMAR]
+    assert parser.grammar is grammar.get_grammar()
+
+
+def test_the_grammar_should_be_compiled_once_by_concurrent_parses(monkeypatch: pytest.MonkeyPatch) -> None:
+    compiled: list[str] = []
+
+    def compile_grammar(rules: str) -> Grammar:
+        compiled.append(rules)
+        time.sleep(0.05)
+        return Grammar(rules)
+
+    monkeypatch.setattr(grammar, '_grammar', None)
+    monkeypatch.setattr(grammar, 'Grammar', compile_grammar)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        grammars = list(executor.map(lambda _: grammar.get_grammar(), range(4)))
+    assert len(compiled) == 1
+    assert all(compiled_grammar is grammars[0] for compiled_grammar in grammars)
+
+
+def test_parsers_should_only_provide_the_grammar_parser_lazily() -> None:
+    assert parsers.SymlParser is grammar.SymlParser
+    with pytest.raises(AttributeError):
+        parsers.Missing  # noqa: B018
@@ -0,0 +1,222 @@
+import pytest
+
+from syml import nodes, parsers
+from syml.basetypes import Document, Pos
+from syml.exceptions import ParseError
+
+
+class TestSymlNode:
+    def test_it_should_work_out_its_source_on_demand(self) -> None:
+        node = nodes.TextLeafNode(document=Document('foo:\n  bar\n', 'foo.txt'), start=7, end=10)
+        source = node.source
+        assert source.filename == 'foo.txt'
+        assert source.start == Pos(index=7, line=2, column=2)
+        assert source.end == Pos(index=10, line=2, column=5)
+        assert node.text == str(source) == 'bar'
+
+    def test_a_key_should_be_its_own_source(self) -> None:
+        node = nodes.KeyLeafNode(document=Document('foo: bar'), start=0, end=3)
+        assert node.key == node.source
+        assert node.as_source() == node.key
+        assert node.as_data() == 'foo'
+
+    def test_nodes_should_be_slotted(self) -> None:
+        root = parsers.parse('foo:\n  - bar\n  - baz: qux\n')
+        for node in root.walk():
+            assert not hasattr(node, '__dict__')
+
+    def test_leaves_should_share_an_empty_tuple_for_children_and_comments(self) -> None:
+        root = parsers.parse('- foo\n- bar\n')
+        leaves = [node for node in root.walk() if node.leaf]
+        assert len(leaves) == 2
+        for leaf in leaves:
+            assert isinstance(leaf.children, tuple)
+            assert isinstance(leaf.comments, tuple)
+
+    def test_nodes_should_share_the_document_and_its_filename(self) -> None:
+        root = parsers.parse('foo: bar\n', filename='foo.syml')
+        assert root.filename == 'foo.syml'
+        for node in root.walk():
+            assert node.document is root.document
+            assert node.filename == 'foo.syml'
+            assert node.full_text == 'foo: bar\n'
+
+    def test_adding_a_comment_should_give_the_node_its_own_list(self) -> None:
+        first = nodes.Comment(document=Document('# one\n# two'), start=2, end=5)
+        second = nodes.Comment(document=Document('# one\n# two'), start=8, end=11)
+        root = nodes.Root(document=first.document, start=0, end=11)
+        root.add_comment(first)
+        root.add_comment(second)
+        assert root.comments == [first, second]
+
+    def test_a_long_text_block_should_be_one_source(self) -> None:
+        lines = [f'line {i}' for i in range(5000)]
+        text = 'prose:\n' + ''.join(f'  {line}\n' for line in lines)
+        source = parsers.parse(text, filename='prose.syml').as_source()['prose']
+        assert source.text == '\n'.join(lines)
+        assert source.filename == 'prose.syml'
+        assert source.start == Pos(index=9, line=2, column=2)
+        assert source.end == Pos(index=len(text) - 1, line=5001, column=11)
+
+
+def describe(root: nodes.Root) -> list[tuple[str, int, int, int | None, str]]:
+    """Describe every node of a tree, with its key and comments."""
+    described: list[tuple[str, int, int, int | None, str]] = []
+    for node in root.walk():
+        attached = [node, *node.comments]
+        if isinstance(node, nodes.KeyValue):
+            attached.append(node.key)
+        described.extend((type(n).__name__, n.start, n.end, n.level, n.text) for n in attached)
+    return described
+
+
+def entries(root: nodes.Root) -> list[nodes.SymlNode]:
+    """Return the top-level entries of a tree."""
+    [container] = list(root.children)
+    return list(container.children)
+
+
+DOCUMENT = """# settings
+alpha:
+  - one
+  - two
+    # about two
+beta: b
+gamma:
+  nested: value
+    continued
+delta: d
+"""
+
+
+class TestFind:
+    @pytest.fixture
+    def root(self) -> nodes.Root:
+        return parsers.parse('services:\n  web:\n    ports:\n      - 80\n      - 443\n  db: x\n  db: y\n')
+
+    def test_it_should_find_values_by_path(self, root: nodes.Root) -> None:
+        assert root.get('services.web.ports[1]') == '443'
+        assert root.get(['services', 'web', 'ports', -2]) == '80'
+        assert root.get('services.web') == {'ports': ['80', '443']}
+        assert root.get('') == root.as_data()
+
+    def test_it_should_find_sources_by_path(self, root: nodes.Root) -> None:
+        source = root.get_source('services.web.ports[0]')
+        assert source == '80'
+        assert source.start.line == 4
+
+    def test_later_keys_should_win(self, root: nodes.Root) -> None:
+        assert root.get('services.db') == 'y'
+
+    def test_it_should_index_keys_only_when_looked_up(self, root: nodes.Root) -> None:
+        [services] = list(root.children)
+        assert isinstance(services, nodes.Mapping)
+        assert services.lookup is None
+        root.get('services.web')
+        assert services.lookup is not None
+        assert list(services.lookup) == ['services']
+
+    def test_it_should_index_every_mapping_up_front(self, root: nodes.Root) -> None:
+        root.index()
+        assert all(node.lookup is not None for node in root.walk() if isinstance(node, nodes.Mapping))
+
+    def test_it_should_drop_the_index_when_a_key_is_added(self, root: nodes.Root) -> None:
+        root.index()
+        root.set('services.cache', 'z')
+        assert root.get('services.cache') == 'z'
+        root.apply_edit(0, 0, 'first: a\n')
+        assert root.get('first') == 'a'
+
+    def test_it_should_report_missing_entries(self, root: nodes.Root) -> None:
+        with pytest.raises(KeyError):
+            root.find('missing')
+        with pytest.raises(IndexError):
+            root.find('services.web.ports[2]')
+        with pytest.raises(TypeError):
+            root.find('services.web.ports.http')
+        with pytest.raises(TypeError):
+            root.find('services[0]')
+
+
+class TestApplyEdit:
+    def edit(self, text: str, start: int, end: int, new_text: str) -> nodes.Root:
+        root = parsers.parse(text, filename='doc.syml')
+        root.apply_edit(start, end, new_text)
+        edited = text[:start] + new_text + text[end:]
+        assert root.document.text == edited
+        assert root.end == len(edited)
+        assert describe(root) == describe(parsers.parse(edited))
+        assert all(node.document is root.document for node in root.walk())
+        return root
+
+    def test_it_should_reparse_only_the_entries_touched(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        root = parsers.parse(DOCUMENT)
+        alpha, beta, gamma, delta = entries(root)
+        monkeypatch.setattr(parsers.FastSymlParser, 'reparse', None)
+        start = DOCUMENT.index('value')
+        root.apply_edit(start, start + len('value'), 'new value\n    more')
+        assert root.as_data() == {
+            'alpha': ['one', 'two'],
+            'beta': 'b',
+            'gamma': {'nested': 'new value\nmore\ncontinued'},
+            'delta': 'd',
+        }
+        new_alpha, new_beta, new_gamma, new_delta = entries(root)
+        assert new_alpha is alpha
+        assert new_beta is beta
+        assert new_gamma is not gamma
+        assert new_delta is delta
+
+    def test_it_should_move_later_nodes_with_their_keys_and_comments(self) -> None:
+        start = DOCUMENT.index('one')
+        root = self.edit(DOCUMENT, start, start + 3, 'three')
+        assert root.as_source()['delta'].start.index == DOCUMENT.index('d\n', DOCUMENT.index('delta')) + 2
+
+    def test_it_should_handle_edits_adding_and_removing_entries(self) -> None:
+        self.edit(DOCUMENT, DOCUMENT.index('beta'), DOCUMENT.index('delta'), '')
+        self.edit(DOCUMENT, DOCUMENT.index('delta'), DOCUMENT.index('delta'), 'epsilon:\n  - e\n')
+        self.edit(DOCUMENT, len(DOCUMENT), len(DOCUMENT), 'zeta: z\n')
+        self.edit(DOCUMENT, DOCUMENT.index('  - two'), DOCUMENT.index('beta'), '')
+
+    def test_it_should_reparse_an_entry_whose_indentation_is_touched(self) -> None:
+        text = 'foo: a\nbar: b\n   baz: c\nqux: d\n'
+        start = text.index('   baz')
+        self.edit(text, start, start + 1, '')
+
+    def test_it_should_reparse_everything_when_the_first_entry_is_touched(self) -> None:
+        self.edit(DOCUMENT, DOCUMENT.index('alpha'), DOCUMENT.index('alpha') + 1, 'A')
+        self.edit(DOCUMENT, 0, 0, '# more settings\n')
+
+    def test_it_should_reparse_everything_when_the_next_entry_no_longer_follows(self) -> None:
+        text = 'foo: a\nbar: b\n  baz: c\n'
+        root = self.edit(text, text.index(' b\n'), text.index('\n  baz'), '')
+        assert root.as_data() == {'foo': 'a', 'bar': {'baz': 'c'}}
+
+    def test_it_should_reparse_everything_in_a_text_document(self) -> None:
+        self.edit('foo\nbar\n', 0, 8, 'baz: qux\n')
+
+    def test_it_should_reparse_an_empty_document(self) -> None:
+        self.edit('', 0, 0, '- foo\n')
+
+    @pytest.mark.parametrize(
+        ('start', 'end', 'new_text'),
+        [
+            (DOCUMENT.index('b\ngamma'), DOCUMENT.index('b\ngamma') + 1, 'b\n  x:y'),
+            (DOCUMENT.index('alpha'), DOCUMENT.index('alpha'), ' - '),
+            (DOCUMENT.index('delta'), DOCUMENT.index('delta'), '  - oops\n'),
+        ],
+    )
+    def test_it_should_leave_the_tree_alone_when_the_edit_fails_to_parse(
+        self, start: int, end: int, new_text: str
+    ) -> None:
+        root = parsers.parse(DOCUMENT)
+        before = describe(root)
+        with pytest.raises(ParseError):
+            root.apply_edit(start, end, new_text)
+        assert root.document.text == DOCUMENT
+        assert describe(root) == before
+
+    def test_it_should_reject_an_edit_out_of_range(self) -> None:
+        root = parsers.parse('foo')
+        with pytest.raises(ValueError, match='Edit out of range'):
+            root.apply_edit(2, 4, 'x')
@@ -1,17 +1,22 @@
+import sys
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
+from operator import itemgetter
+from pathlib import Path
+from typing import Any
 
 import pytest
 
 import syml
 from syml import exceptions, parsers
-from syml.basetypes import Source
+from syml.basetypes import Source, StrPath
 
 
 class TestSymlParser:
-    @pytest.fixture
-    def parser(self) -> parsers.SymlParser:
-        return parsers.SymlParser()
+    @pytest.fixture(params=[parsers.SymlParser, parsers.FastSymlParser])
+    def parser(self, request: pytest.FixtureRequest) -> parsers.SymlParser:
+        return request.param()
 
     def test_it_should_parse_a_simple_text_value(self, parser: parsers.SymlParser) -> None:
         text = textwrap.dedent('true')
@@ -222,8 +227,50 @@ class TestSymlParser:
         with pytest.raises(exceptions.OutOfContextNodeError):
             parser.parse(bad_yaml)
 
+    @pytest.mark.parametrize('bad_syml', ['foo:bar', 'foo: ', '- http://example.com', 'foo: bar\n- baz:qux'])
+    def test_it_fails_parsing_malformed_lines(self, parser: parsers.SymlParser, bad_syml: str) -> None:
+        with pytest.raises(exceptions.MalformedLineError):
+            parser.parse(bad_syml)
+
+    @pytest.mark.parametrize('text', ['-', '- ', '-\t', '-foo'])
+    def test_it_should_parse_bare_dashes_as_text(self, parser: parsers.SymlParser, text: str) -> None:
+        assert parser.parse(text).as_data() == text
+
+    def test_it_should_parse_an_empty_comment(self, parser: parsers.SymlParser) -> None:
+        result = parser.parse('#\nfoo')
+        assert result.as_data() == 'foo'
+        [comment] = list(result.comments)
+        assert comment.source == Source.from_text('', '')
+
 
 class TestSimpleParserFunction:
+    def test_it_should_parse_the_same_tree_with_either_engine(self) -> None:
+        text = textwrap.dedent(
+            """
+            # A comment
+            - foo:
+                - bar: baz
+                  // Another comment
+                  blah:
+                    boo
+                    baloon
+            - - nested
+              - list
+            """
+        )
+        slow = parsers.parse(text, engine='parsimonious')
+        fast = parsers.parse(text, engine='fast')
+        assert fast.as_data() == slow.as_data()
+        assert repr(fast) == repr(slow)
+
+    @pytest.mark.parametrize('engine', ['fast', 'parsimonious'])
+    def test_it_should_parse_data_with_either_engine(self, engine: parsers.Engine) -> None:
+        assert parsers.parse_data('foo:\n  - bar\n  - baz', engine=engine) == {'foo': ['bar', 'baz']}
+
+    def test_it_should_reject_an_unknown_engine(self) -> None:
+        with pytest.raises(ValueError, match='Unknown parser engine'):
+            parsers.parse('foo', engine='bogus')  # type: ignore[arg-type]
+
     def test_it_should_parse_a_simple_list(self) -> None:
         text = textwrap.dedent(
             """
@@ -312,3 +359,188 @@ class TestSimpleParserFunction:
                 'FALSE',
             ],
         }
+
+    def test_it_should_parse_whats_in_the_readme_text_only_from_a_fileobj_with_the_fast_engine(self) -> None:
+        buf = StringIO(
+            textwrap.dedent(
+                """
+            foo:
+              - bar
+              - baz
+              - blah
+                boo
+                baloon
+
+            booleans?:
+              - True
+              - False
+            """
+            )
+        )
+        result = syml.load(buf, engine='fast')
+        assert result == {
+            'foo': [
+                'bar',
+                'baz',
+                'blah\nboo\nbaloon',
+            ],
+            'booleans?': [
+                'True',
+                'False',
+            ],
+        }
+
+    def test_it_should_iterate_over_whats_in_the_readme_from_a_fileobj(self) -> None:
+        buf = StringIO(
+            textwrap.dedent(
+                """
+            foo:
+              - bar
+              - baz
+              - blah
+                boo
+                baloon
+
+            booleans?:
+              - True
+              - False
+            """
+            )
+        )
+        assert list(syml.iter_load(buf)) == [
+            ('foo', ['bar', 'baz', 'blah\nboo\nbaloon']),
+            ('booleans?', ['True', 'False']),
+        ]
+
+    @pytest.mark.parametrize('newline', ['\n', '\r\n', '\r'])
+    @pytest.mark.parametrize('mmap', [True, False])
+    def test_it_should_load_a_path(self, tmp_path: Path, mmap: bool, newline: str) -> None:  # noqa: FBT001
+        path = tmp_path / 'doc.syml'
+        path.write_bytes('foo:\n  - bär\n  - blah\n    boo\n# done\nbaz: qux'.replace('\n', newline).encode())
+        assert syml.load_path(path, mmap=mmap) == {'foo': ['bär', 'blah\nboo'], 'baz': 'qux'}
+        with path.open(encoding='utf-8') as fi:
+            assert syml.load_path(path, mmap=mmap) == syml.load(fi)
+
+    @pytest.mark.parametrize('mmap', [True, False])
+    def test_it_should_load_an_empty_path(self, tmp_path: Path, mmap: bool) -> None:  # noqa: FBT001
+        path = tmp_path / 'empty.syml'
+        path.write_bytes(b'')
+        assert syml.load_path(path, mmap=mmap) is None
+
+    @pytest.mark.parametrize('mmap', [True, False])
+    def test_it_should_report_errors_in_a_path_as_in_the_whole_document(self, tmp_path: Path, mmap: bool) -> None:  # noqa: FBT001
+        path = tmp_path / 'bad.syml'
+        text = 'foo: bär\nbaz:qux\n'
+        path.write_text(text, encoding='utf-8')
+        with pytest.raises(exceptions.MalformedLineError) as exc_info:
+            syml.load_path(path, mmap=mmap)
+        with pytest.raises(exceptions.MalformedLineError) as expected:
+            syml.loads(text)
+        assert exc_info.value.args == expected.value.args
+        assert exc_info.value.filename == path
+
+    def test_it_should_iterate_over_events(self) -> None:
+        assert [(e.type, e.value) for e in syml.iter_events('foo: bar')] == [
+            ('start_mapping', None),
+            ('key', 'foo'),
+            ('scalar', 'bar'),
+            ('end_mapping', None),
+        ]
+
+
+DOCUMENTS: list[tuple[str, Any]] = [
+    ('- foo\n- bar: baz\n  qux: [1]\n', ['foo', {'bar': 'baz', 'qux': '[1]'}]),
+    ('# comment\nkey:\n  - a\n  - b: c\n', {'key': ['a', {'b': 'c'}]}),
+    ('just some\n  text\n', 'just some\ntext'),
+    ('a: 1\n  - bad\n', exceptions.OutOfContextNodeError),
+]
+
+
+class TestSharedParsers:
+    @pytest.fixture(params=['fast', 'parsimonious'])
+    def parser(self, request: pytest.FixtureRequest) -> parsers.SymlParser | parsers.FastSymlParser:
+        return parsers.get_parser(request.param)
+
+    def test_it_should_take_the_filename_of_each_parse(
+        self, parser: parsers.SymlParser | parsers.FastSymlParser
+    ) -> None:
+        first = parser.parse('a: b', filename='first.syml')
+        second = parser.parse('a: b')
+        assert first.document.filename == 'first.syml'
+        assert second.document.filename is None
+        assert first.find(['a']).document is first.document
+
+    def test_it_should_not_keep_the_document_after_a_parse(self) -> None:
+        parser = parsers.SymlParser()
+        parser.parse('a: b')
+        with pytest.raises(exceptions.OutOfContextNodeError):
+            parser.parse('a: 1\n  - bad\n')
+        assert not hasattr(parser.local, 'document')
+
+    @pytest.mark.slow
+    def test_it_should_be_shared_safely_between_threads(
+        self, parser: parsers.SymlParser | parsers.FastSymlParser
+    ) -> None:
+        def parse(number: int) -> tuple[int, Any, StrPath | None]:
+            text, _ = DOCUMENTS[number % len(DOCUMENTS)]
+            filename = f'{number}.syml'
+            try:
+                root = parser.parse(text, filename=filename)
+            except exceptions.ParseError as exc:
+                return number, type(exc), filename
+            assert all(node.document is root.document for node in root.walk())
+            return number, root.as_data(), root.document.filename
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(parse, range(800)))
+        finally:
+            sys.setswitchinterval(interval)
+        for number, data, filename in results:
+            assert data == DOCUMENTS[number % len(DOCUMENTS)][1]
+            assert filename == f'{number}.syml'
+
+
+DEPTH = 5000
+
+
+def spine(data: Any) -> list[str]:  # noqa: ANN401
+    """Describe the first branch of deeply nested data, without recursing (as == would)."""
+    described = []
+    while isinstance(data, list | dict):
+        described.append(type(data).__name__)
+        data = data[0] if isinstance(data, list) else data['k']
+    described.append(repr(data))
+    return described
+
+
+@pytest.mark.slow
+class TestDeeplyNestedDocuments:
+    @pytest.fixture(
+        params=[
+            ('nested_mappings', ''.join(' ' * i + 'k:\n' for i in range(DEPTH)), DEPTH),
+            ('nested_list_items', '- ' * DEPTH + 'x', DEPTH),
+            ('nested_mappings_in_lists', ''.join(' ' * i + '- k:\n' for i in range(DEPTH)), DEPTH * 2),
+            ('long_text', 'line\n' * DEPTH, 0),
+        ],
+        ids=itemgetter(0),
+    )
+    def document(self, request: pytest.FixtureRequest) -> tuple[str, str, int]:
+        return request.param
+
+    def test_it_should_load_the_data_without_recursing(self, document: tuple[str, str, int]) -> None:
+        _, text, depth = document
+        assert len(spine(syml.loads(text))) == depth + 1
+
+    def test_it_should_convert_the_tree_without_recursing(self, document: tuple[str, str, int]) -> None:
+        _, text, _ = document
+        root = parsers.parse(text)
+        assert spine(root.as_data()) == spine(syml.loads(text))
+        assert len(spine(root.as_source())) == len(spine(syml.loads(text)))
+
+    def test_it_should_report_events_without_recursing(self, document: tuple[str, str, int]) -> None:
+        _, text, depth = document
+        events = list(syml.iter_events(text))
+        assert sum(event.type in {'start_list', 'start_mapping'} for event in events) == depth
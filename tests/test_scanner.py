@@ -0,0 +1,40 @@
+import pytest
+
+from syml import exceptions, scanner
+from syml.scanner import COMMENT, KEY_VALUE, LIST_ITEM, TEXT, Element, Line
+
+
+class TestScanLines:
+    def test_it_should_skip_blank_lines(self) -> None:
+        assert list(scanner.scan_lines('\n  \n\t\n')) == []
+
+    def test_it_should_measure_indentation_with_four_space_tabs(self) -> None:
+        assert list(scanner.scan_lines('foo\n\t  bar')) == [
+            Line(0, 0, 3, [Element(TEXT, 0, 3)]),
+            Line(6, 7, 10, [Element(TEXT, 7, 10)]),
+        ]
+
+    def test_it_should_scan_nested_elements(self) -> None:
+        text = '- - foo: bar'
+        assert list(scanner.scan_lines(text)) == [
+            Line(
+                0,
+                0,
+                12,
+                [Element(LIST_ITEM, 0, 12), Element(LIST_ITEM, 2, 12), Element(KEY_VALUE, 4, 8), Element(TEXT, 9, 12)],
+            ),
+        ]
+
+    def test_it_should_end_a_list_item_after_a_bare_section(self) -> None:
+        assert list(scanner.scan_lines('- foo:')) == [
+            Line(0, 0, 6, [Element(LIST_ITEM, 0, 6), Element(KEY_VALUE, 2, 6)]),
+        ]
+
+    def test_it_should_scan_comment_text_without_the_marker(self) -> None:
+        assert list(scanner.scan_lines('  //# foo')) == [Line(2, 2, 9, [Element(COMMENT, 5, 9)])]
+
+    def test_it_should_report_malformed_lines(self) -> None:
+        with pytest.raises(exceptions.MalformedLineError) as exc_info:
+            list(scanner.scan_lines('foo: bar\n  - baz:boo'))
+        _, pos, line = exc_info.value.args
+        assert (pos.line, pos.column, line) == (2, 2, '  - baz:boo')
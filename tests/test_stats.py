@@ -0,0 +1,140 @@
+import time
+from collections.abc import Iterator
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+import syml
+from syml import parsers, stats
+
+DOCUMENT = """\
+a: 1
+# comment
+b:
+  - x
+  - y
+"""
+
+
+@pytest.fixture
+def seen() -> Iterator[list[syml.ParseStats]]:
+    seen: list[syml.ParseStats] = []
+    syml.add_observer(seen.append)
+    yield seen
+    syml.remove_observer(seen.append)
+
+
+@pytest.mark.parametrize(
+    ('engine', 'phases'),
+    [('fast', ['scan', 'build', 'incorporate']), ('parsimonious', ['match', 'visit', 'incorporate'])],
+)
+def test_it_should_time_each_phase_of_parsing_a_tree(engine: parsers.Engine, phases: list[str]) -> None:
+    result = syml.ParseStats()
+    parsers.parse(DOCUMENT, filename=Path('doc.syml'), engine=engine, stats=result)
+    assert sorted(result.phases) == sorted(phases)
+    assert all(elapsed >= 0 for elapsed in result.phases.values())
+    assert result.total_time == sum(result.phases.values())
+    assert (result.engine, result.filename, result.size, result.lines) == (engine, Path('doc.syml'), 30, 6)
+
+
+def test_it_should_count_the_nodes_of_the_tree() -> None:
+    result = syml.ParseStats()
+    parsers.parse(DOCUMENT, stats=result)
+    assert result.nodes == {
+        'Root': 1,
+        'Mapping': 1,
+        'KeyValue': 2,
+        'KeyLeafNode': 2,
+        'List': 1,
+        'ListItem': 2,
+        'TextLeafNode': 3,
+        'Comment': 1,
+    }
+    assert result.max_depth == 6
+    result = syml.ParseStats()
+    parsers.parse('text', stats=result)
+    assert (result.nodes, result.max_depth) == ({'Root': 1, 'TextLeafNode': 1}, 2)
+
+
+def test_it_should_count_the_elements_of_the_lines_when_building_data() -> None:
+    result = syml.ParseStats()
+    assert syml.loads(DOCUMENT, stats=result) == {'a': '1', 'b': ['x', 'y']}
+    assert list(result.phases) == ['build_data']
+    assert result.nodes == {'key_value': 2, 'text': 3, 'comment': 1, 'list_item': 2}
+    assert result.max_depth == 6
+
+
+def test_it_should_time_converting_a_tree_to_data() -> None:
+    result = syml.ParseStats()
+    syml.load(StringIO(DOCUMENT), engine='parsimonious', stats=result)
+    assert sorted(result.phases) == ['as_data', 'incorporate', 'match', 'visit']
+    assert result.nodes['KeyValue'] == 2
+
+
+def test_nested_phases_should_only_count_in_the_innermost_one(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = iter([0.0, 1.0, 3.0, 6.0])
+    monkeypatch.setattr(time, 'perf_counter', lambda: next(clock))
+    result = syml.ParseStats()
+    with result.phase('outer'), result.phase('inner'):
+        pass
+    assert result.phases == {'inner': 2.0, 'outer': 4.0}
+    assert result.total_time == 6.0
+
+
+def test_it_should_time_each_item_of_a_stream_in_a_phase(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = iter([0.0, 1.0, 3.0, 6.0, 10.0, 15.0, 21.0, 28.0])
+    monkeypatch.setattr(time, 'perf_counter', lambda: next(clock))
+    result = syml.ParseStats()
+    with result.phase('outer'):
+        consumed = [(item, dict(result.phases)) for item in result.timed(['a', 'b'], 'inner')]
+    assert consumed == [('a', {}), ('b', {})]
+    assert result.phases == {'inner': 2.0 + 4.0 + 6.0, 'outer': 28.0 - 12.0}
+    clock = iter([0.0, 1.0, 3.0, 6.0])
+    assert list(result.timed(['c'], 'alone')) == ['c']
+    assert result.phases['alone'] == 4.0
+
+
+def test_it_should_measure_the_size_in_utf8_bytes() -> None:
+    result = syml.ParseStats()
+    syml.loads('café: ☕', stats=result)
+    assert (result.size, result.lines) == (10, 1)
+
+
+def test_it_should_export_plain_values() -> None:
+    result = syml.ParseStats()
+    syml.loads('- a', filename=Path('doc.syml'), stats=result)
+    exported = result.as_dict()
+    assert exported['filename'] == 'doc.syml'
+    assert exported['nodes'] == {'list_item': 1, 'text': 1}
+    assert exported['total_time'] == result.total_time
+    assert 'nested' not in exported
+    assert syml.ParseStats().as_dict()['filename'] is None
+
+
+def test_observers_should_see_every_parse(seen: list[syml.ParseStats]) -> None:
+    syml.loads(DOCUMENT)
+    syml.loads(DOCUMENT, lazy=True)
+    given = syml.ParseStats()
+    parsers.parse_data(DOCUMENT, engine='parsimonious', stats=given)
+    assert [result.engine for result in seen] == ['fast', 'fast', 'parsimonious']
+    assert seen[2] is given
+    assert 'build' in seen[1].phases
+
+
+def test_observers_should_be_removable(seen: list[syml.ParseStats]) -> None:
+    syml.remove_observer(seen.append)
+    syml.loads(DOCUMENT)
+    syml.add_observer(seen.append)
+    assert seen == []
+
+
+def test_it_should_not_instrument_parsing_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args: object) -> None:
+        raise AssertionError('instrumented')
+
+    monkeypatch.setattr(stats.ParseStats, 'start', fail)
+    for engine in ('fast', 'parsimonious'):
+        parsers.parse(DOCUMENT, engine=engine)
+        parsers.parse_data(DOCUMENT, engine=engine)
+    assert stats.observers == []
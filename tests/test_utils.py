@@ -1,8 +1,12 @@
+import sys
 import textwrap
+from pathlib import Path
 
 import pytest
 
+import syml
 from syml import utils
+from syml.basetypes import Document
 
 
 class TestGetLine:
@@ -23,3 +27,134 @@ class TestGetLine:
 
     def test_it_should_get_a_blank_str_for_bad_line(self, text: str) -> None:
         assert utils.get_line(text, 99) == ''
+
+
+class TestLineIndex:
+    @pytest.fixture
+    def index(self) -> utils.LineIndex:
+        return utils.LineIndex.from_text('foo\n  bar\r\n\nbaz')
+
+    def test_it_should_record_the_start_of_each_line(self, index: utils.LineIndex) -> None:
+        assert index.starts == (0, 4, 11, 12, 15)
+        assert index.line_count == 4
+
+    def test_it_should_locate_an_index(self, index: utils.LineIndex) -> None:
+        assert index.locate(0) == (1, 0)
+        assert index.locate(6) == (2, 2)
+        assert index.locate(10) == (2, 6)
+        assert index.locate(14) == (4, 2)
+
+    def test_it_should_locate_an_index_past_the_end_on_the_last_line(self, index: utils.LineIndex) -> None:
+        assert index.locate(99) == (4, 0)
+
+    def test_it_should_locate_an_index_in_an_empty_document_on_the_first_line(self) -> None:
+        assert utils.LineIndex.from_text('').locate(0) == (1, 0)
+
+    def test_it_should_be_kept_by_the_document_until_it_is_edited(self) -> None:
+        document = Document('foo\nbar')
+        index = document.lines
+        assert document.lines is index
+        assert index.starts == (0, 4, 7)
+        document.text = 'foo\nbar\nbaz'
+        assert document.lines.starts == (0, 4, 8, 11)
+
+
+class TestPathCache:
+    @pytest.fixture
+    def cache(self) -> utils.PathCache[int]:
+        return utils.PathCache(len, maxsize=2)
+
+    def test_it_should_count_hits_and_misses(self, cache: utils.PathCache[int]) -> None:
+        assert cache('foo') == 3
+        assert cache('foo') == 3
+        assert cache('blah') == 4
+        info = cache.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+        assert info.currbytes == sys.getsizeof('foo') + sys.getsizeof(3) + sys.getsizeof('blah') + sys.getsizeof(4)
+
+    def test_it_should_evict_the_least_recently_used_path(self, cache: utils.PathCache[int]) -> None:
+        cache('foo')
+        cache('bar')
+        cache('foo')
+        cache('baz')
+        cache('foo')
+        cache('bar')
+        assert cache.cache_info().misses == 4
+
+    def test_it_should_evict_paths_over_the_byte_budget(self, cache: utils.PathCache[int]) -> None:
+        cache.configure(maxbytes=sys.getsizeof('x' * 100) + sys.getsizeof(100))
+        cache('x' * 100)
+        assert cache.cache_info().currsize == 1
+        cache('y' * 100)
+        assert cache.cache_info().currsize == 1
+        cache('z' * 1000)
+        cache('z' * 1000)
+        info = cache.cache_info()
+        assert (info.hits, info.currsize, info.currbytes) == (1, 1, sys.getsizeof('z' * 1000) + sys.getsizeof(1000))
+
+    def test_it_should_count_the_size_of_cached_values(self) -> None:
+        cache = utils.PathCache(utils.parse_path, sizeof=utils.keys_size)
+        keys = cache('foo[0]')
+        assert utils.keys_size(keys) == sys.getsizeof(('foo', 0)) + sys.getsizeof('foo') + sys.getsizeof(0)
+        assert cache.cache_info().currbytes == sys.getsizeof('foo[0]') + utils.keys_size(keys)
+
+    def test_it_should_evict_paths_when_shrunk(self, cache: utils.PathCache[int]) -> None:
+        cache('foo')
+        cache('bar')
+        cache.configure(maxsize=0)
+        assert cache.cache_info().currsize == 1
+
+    def test_it_should_clear_the_cache(self, cache: utils.PathCache[int]) -> None:
+        cache('foo')
+        cache('foo')
+        cache.cache_clear()
+        assert cache.cache_info() == utils.CacheInfo(0, 0, 2, 0, 2**20, 0)
+
+    def test_it_should_be_cleared_by_syml(self) -> None:
+        utils.path_keys('foo.bar')
+        syml.clear_caches()
+        assert utils.parsed_paths.cache_info().currsize == 0
+
+
+class TestParsePath:
+    @pytest.mark.parametrize(
+        ('path', 'keys'),
+        [
+            ('', ()),
+            ('foo', ('foo',)),
+            ('services.web.ports[0]', ('services', 'web', 'ports', 0)),
+            ('[1][-2].name', (1, -2, 'name')),
+            ('a b.c-d', ('a b', 'c-d')),
+        ],
+    )
+    def test_it_should_split_keys_and_indices(self, path: str, keys: tuple[str | int, ...]) -> None:
+        assert utils.parse_path(path) == keys
+
+    @pytest.mark.parametrize('path', ['foo.', '.foo', 'foo..bar', 'foo[x]', 'foo[0]bar', 'foo]'])
+    def test_it_should_reject_invalid_paths(self, path: str) -> None:
+        with pytest.raises(ValueError, match='Invalid path'):
+            utils.parse_path(path)
+
+    def test_it_should_pass_sequences_through(self) -> None:
+        keys: list[str | int] = ['foo', 0]
+        assert utils.path_keys(keys) is keys
+        assert utils.path_keys('foo[0]') == ('foo', 0)
+
+
+class TestIterMappedLines:
+    def test_it_should_yield_decoded_lines_with_their_endings(self, tmp_path: Path) -> None:
+        path = tmp_path / 'doc.syml'
+        path.write_bytes('foo:\n  - bär\n\n  - baz'.encode())
+        assert list(utils.iter_mapped_lines(path)) == ['foo:\n', '  - bär\n', '\n', '  - baz']
+
+    def test_it_should_translate_newlines_as_text_mode_does(self, tmp_path: Path) -> None:
+        path = tmp_path / 'doc.syml'
+        path.write_bytes(b'a\r\nb\rc\r\r\nd\r')
+        assert list(utils.iter_mapped_lines(path)) == ['a\n', 'b\n', 'c\n', '\n', 'd\n']
+        with path.open(encoding='utf-8') as fi:
+            assert ''.join(utils.iter_mapped_lines(path)) == fi.read()
+
+    def test_it_should_yield_nothing_for_an_empty_file(self, tmp_path: Path) -> None:
+        path = tmp_path / 'empty.syml'
+        path.write_bytes(b'')
+        assert list(utils.iter_mapped_lines(path)) == []
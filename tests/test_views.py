@@ -0,0 +1,94 @@
+import io
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import pytest
+
+import syml
+from syml import views
+from syml.cache import DiskCache
+
+DOCUMENT = """\
+name: example
+servers:
+  - host: alpha
+    ports:
+      - 80
+      - 443
+  - host: beta
+notes: first
+  second
+empty:
+"""
+
+
+@pytest.fixture
+def data() -> syml.LazyMapping:
+    return syml.loads(DOCUMENT, lazy=True)  # type: ignore[return-value]
+
+
+def test_it_should_load_views_equal_to_the_data(data: syml.LazyMapping) -> None:
+    assert isinstance(data, Mapping)
+    assert data == syml.loads(DOCUMENT)
+    assert len(data) == 4
+    assert list(data) == ['name', 'servers', 'notes', 'empty']
+    assert data['notes'] == 'first\nsecond'
+    assert data['empty'] is None
+    assert data.get('missing') is None
+
+
+def test_it_should_convert_values_only_when_accessed(data: syml.LazyMapping) -> None:
+    assert data.cache == {}
+    servers = data['servers']
+    assert isinstance(servers, syml.LazyList)
+    assert list(data.cache) == ['servers']
+    assert servers.cache == [..., ...]
+    assert servers[-1] == {'host': 'beta'}
+    assert servers.cache[0] is ...
+
+
+def test_it_should_keep_converted_values(data: syml.LazyMapping) -> None:
+    assert data['servers'] is data['servers']
+    assert data['servers'][0] is data['servers'][0]
+
+
+def test_lists_should_behave_as_sequences(data: syml.LazyMapping) -> None:
+    ports = data['servers'][0]['ports']
+    assert isinstance(ports, Sequence)
+    assert ports == ['80', '443']
+    assert {'ports': ['80', '443']} == {'ports': ports}
+    assert ports != ['80']
+    assert ports != '80443'
+    assert ports[::-1] == ['443', '80']
+    assert '443' in ports
+    assert ports.index('443') == 1
+    with pytest.raises(IndexError):
+        ports[2]
+    with pytest.raises(TypeError):
+        hash(ports)
+
+
+def test_views_should_be_read_only(data: syml.LazyMapping) -> None:
+    with pytest.raises(TypeError):
+        data['name'] = 'other'  # type: ignore[index]
+
+
+def test_views_should_show_their_data() -> None:
+    assert repr(syml.loads('- a\n- b: c\n', lazy=True)) == "LazyList(['a', LazyMapping({'b': 'c'})])"
+
+
+def test_it_should_load_text_and_empty_documents() -> None:
+    assert syml.loads('foo\nbar', lazy=True) == 'foo\nbar'
+    assert syml.loads('# nothing\n', lazy=True) is None
+    assert views.view(None) is None
+
+
+def test_it_should_load_lazily_from_a_file() -> None:
+    data = syml.load(io.StringIO(DOCUMENT), lazy=True)
+    assert isinstance(data, syml.LazyMapping)
+    assert data['servers'][1]['host'] == 'beta'
+
+
+def test_it_should_refuse_a_cache(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match='cannot use a cache'):
+        syml.loads(DOCUMENT, cache=DiskCache(tmp_path), lazy=True)